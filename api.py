@@ -6,8 +6,6 @@ integrating the compiler, decoder, and transformer components.
 """
 
 from .compiler.compiler import Compiler
-from .decoder.decoder import Decoder
-from .transformer.transformer import MatricesTransformer
 import os
 
 class PAILangTooling:
@@ -37,10 +35,52 @@ class PAILangTooling:
         # Create data directory if it doesn't exist
         os.makedirs(os.path.dirname(token_registry_path), exist_ok=True)
         
-        # Initialize components
-        self.compiler = Compiler(token_registry_path=token_registry_path)
-        self.decoder = Decoder()
-        self.transformer = MatricesTransformer(matrix_dir=matrix_dir)
+        # Store configuration; components are created on first access
+        self._token_registry_path = token_registry_path
+        self._matrix_dir = matrix_dir
+        self._compiler = None
+        self._decoder = None
+        self._transformer = None
+    
+    @property
+    def compiler(self):
+        """
+        Compiler for NL/CL to pAI_Lang, created on first access.
+        
+        Returns:
+            Compiler: The compiler instance.
+        """
+        if self._compiler is None:
+            self._compiler = Compiler(token_registry_path=self._token_registry_path)
+        return self._compiler
+    
+    @property
+    def decoder(self):
+        """
+        Decoder for pAI_Lang to CL/NL, created on first access.
+        
+        Returns:
+            Decoder: The decoder instance.
+        """
+        if self._decoder is None:
+            from .decoder.decoder import Decoder
+            self._decoder = Decoder()
+        return self._decoder
+    
+    @property
+    def transformer(self):
+        """
+        Matrices transformer, created on first access.
+        
+        Matrix files are only loaded when a direct transformation is requested.
+        
+        Returns:
+            MatricesTransformer: The transformer instance.
+        """
+        if self._transformer is None:
+            from .transformer.transformer import MatricesTransformer
+            self._transformer = MatricesTransformer(matrix_dir=self._matrix_dir)
+        return self._transformer
     
     def compile(self, input_text, input_type="NL"):
         """
@@ -143,6 +183,17 @@ class PAILangTooling:
         """
         return self.compiler.register_token(value, category, token_id)
     
+    def clear_cache(self):
+        """
+        Clear cached compilation and transformation results.
+        
+        Only components that have already been created are affected.
+        """
+        if self._compiler is not None:
+            self._compiler.clear_cache()
+        if self._transformer is not None:
+            self._transformer.clear_cache()
+    
     def get_value_from_token(self, token):
         """
         Get the value associated with a token ID.
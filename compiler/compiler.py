@@ -5,8 +5,8 @@ This module provides the main Compiler class that coordinates
 the compilation process from Natural Language or Command Language to pAI_Lang.
 """
 
-from .parser.nl_parser import NLParser
-from .parser.cl_parser import CLParser
+from .parser.nl_parser import get_nl_parser
+from .parser.cl_parser import get_cl_parser
 from .semantic_analyzer import SemanticAnalyzer
 from .structure_synthesizer import StructureSynthesizer
 from ..utils.debug_logger import logger
@@ -16,6 +16,9 @@ class Compiler:
     Compiles Natural Language or Command Language to pAI_Lang.
     """
     
+    # Maximum number of compiled results kept in the cache
+    max_cache_size = 512
+    
     def __init__(self, token_registry_path=None):
         """
         Initialize the compiler.
@@ -24,10 +27,13 @@ class Compiler:
             token_registry_path (str, optional): Path to token registry file.
         """
         logger.debug("Initializing Compiler")
-        self.nl_parser = NLParser()
-        self.cl_parser = CLParser()
+        self.nl_parser = get_nl_parser()
+        self.cl_parser = get_cl_parser()
         self.semantic_analyzer = SemanticAnalyzer(token_registry_path=token_registry_path)
         self.structure_synthesizer = StructureSynthesizer()
+        
+        # Cache of compiled results keyed by (input_type, input_text)
+        self.cache = {}
     
     def compile(self, input_text, input_type="NL"):
         """
@@ -40,22 +46,39 @@ class Compiler:
         Returns:
             str: Compiled pAI_Lang string.
         """
-        logger.debug(f"Compiling {input_type} input: {input_text}")
+        logger.debug("Compiling %s input: %s", input_type, input_text)
+        
+        # Check cache first
+        cache_key = (input_type, input_text)
+        if cache_key in self.cache:
+            logger.debug("Using cached compilation result")
+            return self.cache[cache_key]
         
         # Parse input
         parsed_input = self._parse_input(input_text, input_type)
-        logger.debug(f"Parsed input: {parsed_input}")
+        logger.debug("Parsed input: %s", parsed_input)
         
         # Analyze semantics
         semantic_analysis = self.semantic_analyzer.analyze(parsed_input)
-        logger.debug(f"Semantic analysis: {semantic_analysis}")
+        logger.debug("Semantic analysis: %s", semantic_analysis)
         
         # Synthesize pAI_Lang
         pailang_string = self.structure_synthesizer.synthesize(semantic_analysis)
-        logger.debug(f"Synthesized pAI_Lang: {pailang_string}")
+        logger.debug("Synthesized pAI_Lang: %s", pailang_string)
+        
+        # Store in cache, evicting the oldest entry when full
+        if len(self.cache) >= self.max_cache_size:
+            del self.cache[next(iter(self.cache))]
+        self.cache[cache_key] = pailang_string
         
         return pailang_string
     
+    def clear_cache(self):
+        """
+        Clear the cache of compiled results.
+        """
+        self.cache = {}
+    
     def _parse_input(self, input_text, input_type):
         """
         Parse input text based on input type.
@@ -67,7 +90,7 @@ class Compiler:
         Returns:
             dict: Parsed input.
         """
-        logger.debug(f"Parsing {input_type} input")
+        logger.debug("Parsing %s input", input_type)
         if input_type.upper() == "CL":
             return {
                 "type": "CL",
@@ -96,6 +119,9 @@ class Compiler:
         """
         Register a token ID for a value in a specific category.
         
+        Cached compilation results are discarded, since they may refer to
+        a previous token for the value.
+        
         Args:
             value (str): The value to register.
             category (str): The category of the token.
@@ -104,6 +130,7 @@ class Compiler:
         Returns:
             bool: True if registration was successful, False otherwise.
         """
+        self.clear_cache()
         return self.semantic_analyzer.register_token(value, category, token_id)
     
     def get_value_from_token(self, token):
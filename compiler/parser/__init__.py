@@ -5,8 +5,13 @@ This module provides the main Parser class that coordinates
 the parsing of Natural Language and Command Language inputs.
 """
 
-from .nl_parser import NLParser
-from .cl_parser import CLParser
+import re
+
+from .nl_parser import NLParser, get_nl_parser
+from .cl_parser import CLParser, Command, get_cl_parser
+
+# Command Language marker: a line starting with ">>>" followed by a command
+_CL_DETECT = re.compile(r'^\s*>>>\s+\w+', re.MULTILINE)
 
 class Parser:
     """
@@ -17,8 +22,8 @@ class Parser:
         """
         Initialize the parser.
         """
-        self.nl_parser = NLParser()
-        self.cl_parser = CLParser()
+        self.nl_parser = get_nl_parser()
+        self.cl_parser = get_cl_parser()
     
     def parse(self, input_text):
         """
@@ -55,8 +60,7 @@ class Parser:
             str: "CL" for Command Language, "NL" for Natural Language.
         """
         # Check for Command Language pattern (>>> prefix)
-        import re
-        if re.search(r'^\s*>>>\s+\w+', input_text, re.MULTILINE):
+        if _CL_DETECT.search(input_text):
             return "CL"
         else:
             return "NL"
@@ -5,40 +5,127 @@ This module provides functionality for parsing Command Language inputs.
 """
 
 import re
+import sys
+from types import MappingProxyType
+
+from ..records import Record
+from ...utils.debug_logger import logger
+
+class Command(Record):
+    """
+    Parsed Command Language command.
+    
+    Commands are slotted records rather than dicts, which keeps large
+    command lists compact. Dict-style access (command["name"],
+    command.get("children", [])) is still supported for existing callers.
+    """
+    
+    __slots__ = ("name", "parameters", "indentation", "line", "children")
+    _fields = __slots__
+    
+    def __init__(self, name, parameters, indentation, line, children=None):
+        """
+        Initialize a command.
+        
+        Args:
+            name (str): Command name.
+            parameters (dict): Parsed parameters.
+            indentation (int): Width of the whitespace before ">>>".
+            line (str): Original command line.
+            children (list, optional): Nested commands. Defaults to an empty list.
+        """
+        self.name = name
+        self.parameters = parameters
+        self.indentation = indentation
+        self.line = line
+        self.children = [] if children is None else children
+    
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+    
+    def to_dict(self):
+        """
+        Convert the command and its children to plain dicts.
+        
+        Returns:
+            dict: Dict representation of the command.
+        """
+        return {
+            "name": self.name,
+            "parameters": self.parameters,
+            "indentation": self.indentation,
+            "line": self.line,
+            "children": [child.to_dict() for child in self.children]
+        }
 
 class CLParser:
     """
     Parser for Command Language inputs.
     """
     
+    # Full-line command pattern: leading indentation, the ">>>" marker,
+    # the command name (the text up to the first "["), and an optional
+    # bracketed parameter list
+    _CMD_RE = re.compile(
+        r'^(?P<indent>[^\S\n]*)(?P<line>>>>(?P<name>[^\[\n]*)'
+        r'(?:\[(?P<params>[^\]\n]*)\])?[^\n]*)',
+        re.MULTILINE
+    )
+    
+    # Well-formed command name; other names are parsed but reported
+    _NAME_RE = re.compile(r'[A-Z_][A-Z0-9_]*')
+    
+    # Top-level parameter segment after the start or a comma: plain
+    # characters and bracketed groups (an unclosed bracket extends to the
+    # end of the string). Segments may be empty
+    _PARAM_SPLIT = re.compile(r'(?:^|,)((?:[^,\[\]]|\[[^\]]*(?:\]|$))*)')
+    
+    # "key=value" parameter, split at the first "=" with whitespace trimmed
+    _KV_RE = re.compile(r'\s*([^=]*?)\s*=\s*(.*?)\s*$', re.DOTALL)
+    
+    # Known command types and their required parameters
+    _COMMAND_TYPES = MappingProxyType({
+        "INITIALIZE": ("SYSTEM",),
+        "SET_CONTEXT": ("CONTEXT",),
+        "EXECUTE": ("TASK",),
+        "EXECUTE_TASK": ("TASK",),
+        "CONDITIONAL": ("CONDITION",),
+        "PARALLEL": (),
+        "REPEAT": ("count",),
+        "BATCH_OPERATION": ("BATCH",),
+        "ACTIVATE_CONTEXT": ("CONTEXT",),
+        "ALLOCATE_RESOURCE": ("RESOURCE",),
+        "APPLY_SECURITY": ("SECURITY",),
+        "EXECUTE_QUERY": ("QUERY",)
+    })
+    
+    # Names of the known command types, for membership checks
+    _COMMAND_NAMES = frozenset(_COMMAND_TYPES)
+    
     def __init__(self):
         """
         Initialize the CL parser.
         
-        Sets up the command patterns and syntax rules for parsing
-        Command Language inputs according to the pAI_Lang specification.
-        """
-        # Define command patterns for recognition
-        self.command_pattern = r'^\s*>>>\s*([A-Z_]+)(?:\[([^\]]*)\])?'
-        
-        # Define known command types and their required parameters
-        self.command_types = {
-            "INITIALIZE": ["SYSTEM"],
-            "SET_CONTEXT": ["CONTEXT"],
-            "EXECUTE": ["TASK"],
-            "EXECUTE_TASK": ["TASK"],
-            "CONDITIONAL": ["CONDITION"],
-            "PARALLEL": [],
-            "REPEAT": ["count"],
-            "BATCH_OPERATION": ["BATCH"],
-            "ACTIVATE_CONTEXT": ["CONTEXT"],
-            "ALLOCATE_RESOURCE": ["RESOURCE"],
-            "APPLY_SECURITY": ["SECURITY"],
-            "EXECUTE_QUERY": ["QUERY"]
-        }
+        The command patterns and syntax rules for parsing Command Language
+        inputs according to the pAI_Lang specification are shared
+        class-level constants; the instance only exposes them.
+        """
+        self.command_types = self._COMMAND_TYPES
+        self.command_regex = self._CMD_RE
+    
+    def is_known_command(self, name):
+        """
+        Check whether a command name is one of the known command types.
         
-        # Compile regex patterns for efficient parsing
-        self.command_regex = re.compile(self.command_pattern)
+        Args:
+            name (str): Command name.
+            
+        Returns:
+            bool: True if the command type is known, False otherwise.
+        """
+        return name in self._COMMAND_NAMES
     
     def parse(self, cl_text):
         """
@@ -78,46 +165,37 @@ class CLParser:
         """
         Parse commands from Command Language text.
         
+        Commands are extracted in a single scan of the input with the
+        precompiled command regex; indentation, name, and parameters are
+        read directly from the match groups. Commands whose name is not an
+        upper-case identifier are kept and reported with a warning.
+        
         Args:
             cl_text (str): Command Language input text.
             
         Returns:
-            list: Parsed commands.
+            list: Parsed commands (Command instances).
         """
         commands = []
-        lines = cl_text.strip().split('\n')
         
-        for line in lines:
-            line = line.strip()
+        for match in self._CMD_RE.finditer(cl_text):
+            name = match.group("name").strip()
+            line = match.group("line").rstrip()
+            if not self._NAME_RE.fullmatch(name):
+                logger.warning(f"Unrecognized command name in CL line: {line}")
+            
+            # Extract parameters if present
+            params_str = match.group("params")
+            if params_str is not None:
+                parameters = self._parse_parameters(params_str.strip())
+            else:
+                parameters = {}
             
-            # Skip empty lines
-            if not line:
-                continue
+            # Count indentation (width of whitespace before >>>)
+            indentation = len(match.group("indent").expandtabs(4))
+            command = Command(sys.intern(name), parameters, indentation, line)
             
-            # Check if line starts with >>>
-            if line.startswith('>>>'):
-                # Extract command and parameters
-                command_parts = line[3:].strip().split('[', 1)
-                command_name = command_parts[0].strip()
-                
-                command = {
-                    "name": command_name,
-                    "parameters": {},
-                    "indentation": 0,
-                    "line": line
-                }
-                
-                # Count indentation (number of spaces before >>>)
-                indentation_match = re.match(r'^(\s*)>>>', line)
-                if indentation_match:
-                    command["indentation"] = len(indentation_match.group(1))
-                
-                # Extract parameters if present
-                if len(command_parts) > 1 and ']' in command_parts[1]:
-                    params_str = command_parts[1].split(']', 1)[0].strip()
-                    command["parameters"] = self._parse_parameters(params_str)
-                
-                commands.append(command)
+            commands.append(command)
         
         return commands
     
@@ -137,36 +215,20 @@ class CLParser:
         if not params_str:
             return params
         
-        # Split by commas, but respect nested structures
-        param_parts = []
-        current_part = ""
-        bracket_depth = 0
-        
-        for char in params_str:
-            if char == '[':
-                bracket_depth += 1
-                current_part += char
-            elif char == ']':
-                bracket_depth -= 1
-                current_part += char
-            elif char == ',' and bracket_depth == 0:
-                param_parts.append(current_part.strip())
-                current_part = ""
-            else:
-                current_part += char
-        
-        # Add the last part if not empty
-        if current_part.strip():
-            param_parts.append(current_part.strip())
+        # Split by top-level commas (nested brackets stay in one part).
+        # Empty parts become "" keys, except a trailing one
+        param_parts = self._PARAM_SPLIT.findall(params_str)
+        if not param_parts[-1].strip():
+            param_parts.pop()
         
         # Process each parameter part
         for part in param_parts:
-            if '=' in part:
-                key, value = part.split('=', 1)
-                params[key.strip()] = value.strip()
+            kv_match = self._KV_RE.match(part)
+            if kv_match:
+                params[sys.intern(kv_match.group(1))] = kv_match.group(2)
             else:
                 # For parameters without explicit key
-                params[part.strip()] = True
+                params[sys.intern(part.strip())] = True
         
         return params
     
@@ -174,34 +236,71 @@ class CLParser:
         """
         Build command hierarchy based on indentation.
         
+        The hierarchy nodes are the commands themselves (their children
+        lists are filled in), so the flat command list and the hierarchy
+        are two views of the same objects.
+        
         Args:
             commands (list): List of parsed commands.
             
         Returns:
             list: Command hierarchy with parent-child relationships.
         """
+        # Resolve each command's parent index in one sweep over the
+        # indentation levels (-1 marks a root command)
+        indents = [command.indentation for command in commands]
+        parents = self._resolve_parents(indents)
+        
         hierarchy = []
-        stack = []
         
-        for command in commands:
-            indentation = command["indentation"]
+        for command, parent in zip(commands, parents):
+            # Add as child to parent, or to the root hierarchy
+            if parent >= 0:
+                commands[parent].children.append(command)
+            else:
+                hierarchy.append(command)
+        
+        return hierarchy
+    
+    @staticmethod
+    def _resolve_parents(indents):
+        """
+        Resolve parent indices from a list of indentation levels.
+        
+        Args:
+            indents (list): Indentation level of each command.
             
+        Returns:
+            list: Index of each command's parent, or -1 for root commands.
+        """
+        parents = []
+        stack = []
+        
+        for i, indentation in enumerate(indents):
             # Pop stack until we find a parent with less indentation
-            while stack and stack[-1]["indentation"] >= indentation:
+            while stack and indents[stack[-1]] >= indentation:
                 stack.pop()
             
-            # Create a copy of the command with children
-            command_node = command.copy()
-            command_node["children"] = []
-            
-            # Add as child to parent if stack is not empty
-            if stack:
-                stack[-1]["children"].append(command_node)
-            else:
-                # Add to root hierarchy
-                hierarchy.append(command_node)
-            
-            # Push to stack
-            stack.append(command_node)
+            parents.append(stack[-1] if stack else -1)
+            stack.append(i)
         
-        return hierarchy
+        return parents
+
+
+# Shared parser instance returned by get_cl_parser()
+_DEFAULT_CL_PARSER = None
+
+def get_cl_parser():
+    """
+    Get the shared CL parser instance.
+    
+    The parser keeps only compiled regexes and constant command tables,
+    so one instance is safely reused by every caller.
+    
+    Returns:
+        CLParser: The shared parser instance.
+    """
+    global _DEFAULT_CL_PARSER
+    if _DEFAULT_CL_PARSER is None:
+        _DEFAULT_CL_PARSER = CLParser()
+    return _DEFAULT_CL_PARSER
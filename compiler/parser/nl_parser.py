@@ -6,20 +6,84 @@ This module provides functionality for parsing Natural Language inputs.
 
 import re
 
+from ..records import MISSING, Record
+
+class Intent(Record):
+    """
+    Recognized intent: category, pattern, matched text, and captured groups.
+    """
+    
+    __slots__ = ("category", "pattern", "match", "groups")
+    _fields = __slots__
+    
+    def __init__(self, category, pattern, match, groups=MISSING):
+        self.category = category
+        self.pattern = pattern
+        self.match = match
+        self.groups = groups
+
+class Entity(Record):
+    """
+    Extracted entity: type, pattern, matched text, and entity value.
+    """
+    
+    __slots__ = ("type", "pattern", "match", "value")
+    _fields = __slots__
+    
+    def __init__(self, type, pattern, match, value=MISSING):
+        self.type = type
+        self.pattern = pattern
+        self.match = match
+        self.value = value
+
+# Relationship patterns, compiled once at import. Each pattern is paired
+# with a literal it cannot match without, so the backtracking (.+?) scans
+# only run on text that contains that literal.
+_SEQUENCE_PATTERNS = [
+    (re.compile(r"(.+?) then (.+)", re.IGNORECASE), " then "),
+    (re.compile(r"(.+?) followed by (.+)", re.IGNORECASE), " followed by "),
+    (re.compile(r"after (.+?) do (.+)", re.IGNORECASE), " do ")
+]
+
+_PARALLEL_PATTERNS = [
+    (re.compile(r"(.+?) and (.+?) simultaneously", re.IGNORECASE), " simultaneously"),
+    (re.compile(r"(.+?) in parallel with (.+?)", re.IGNORECASE), " in parallel with "),
+    (re.compile(r"concurrently (.+?) and (.+?)", re.IGNORECASE), "concurrently ")
+]
+
+_CONDITIONAL_PATTERNS = [
+    (re.compile(r"if (.+?) then (.+?)(?: else (.+))?", re.IGNORECASE), " then "),
+    (re.compile(r"when (.+?) do (.+?)(?: otherwise (.+))?", re.IGNORECASE), " do ")
+]
+
+_REPETITION_PATTERNS = [
+    (re.compile(r"repeat (.+?) (\d+) times", re.IGNORECASE), " times"),
+    (re.compile(r"do (.+?) (\d+) times", re.IGNORECASE), " times")
+]
+
 class NLParser:
     """
     Parser for Natural Language inputs.
     """
     
+    # Maximum number of parse results kept in the cache
+    max_cache_size = 4096
+    
     def __init__(self):
         """
         Initialize the NL parser.
         """
         # Initialize patterns for intent recognition
-        self.intent_patterns = self._initialize_intent_patterns()
+        self.intent_patterns = self._compile_patterns(self._initialize_intent_patterns())
         
         # Initialize patterns for entity extraction
-        self.entity_patterns = self._initialize_entity_patterns()
+        self.entity_patterns = self._compile_patterns(self._initialize_entity_patterns())
+        
+        # Initialize the trigger prefilter shared by all three parsing stages
+        self.prefilter = self._compile_prefilter(self._initialize_triggers())
+        
+        # Cache of parse results keyed by input text
+        self.cache = {}
     
     def parse(self, nl_text):
         """
@@ -37,27 +101,178 @@ class NLParser:
         """
         Parse Natural Language input.
         
+        Parsing depends only on the input text, so results are cached. The
+        cached result is never handed out; each call returns a copy, so
+        callers may modify it. The cache is not synchronized; share a parser
+        between threads only with external locking.
+        
         Args:
             nl_text (str): Natural Language input text.
             
         Returns:
             dict: Parsed representation with intents, entities, and relationships.
         """
+        # Check cache first
+        result = self.cache.get(nl_text)
+        if result is not None:
+            return self._copy_result(result)
+        
+        # Find trigger literals for all stages in a single scan
+        candidates = self._find_categories(nl_text, self.prefilter)
+        
         # Recognize intents
-        intents = self._recognize_intents(nl_text)
+        intents = self._recognize_intents(nl_text, candidates)
         
         # Extract entities
-        entities = self._extract_entities(nl_text, intents)
+        entities = self._extract_entities(nl_text, intents, candidates)
         
         # Extract relationships
-        relationships = self._extract_relationships(nl_text, entities)
+        relationships = self._extract_relationships(nl_text, entities, candidates)
         
-        return {
+        result = {
             "intents": intents,
             "entities": entities,
             "relationships": relationships,
             "original_text": nl_text
         }
+        
+        # Store in cache, evicting the oldest entry when full
+        if len(self.cache) >= self.max_cache_size:
+            self.cache.pop(next(iter(self.cache)), None)
+        self.cache[nl_text] = result
+        
+        return self._copy_result(result)
+    
+    def parse_many(self, texts):
+        """
+        Parse a batch of Natural Language inputs.
+        
+        Inputs are parsed in order in the calling thread; the re module holds
+        the GIL while matching, so a thread pool would not run them in
+        parallel. Repeated inputs are served from the parse cache.
+        
+        Args:
+            texts (iterable): Natural Language input texts.
+            
+        Returns:
+            list: Parsed representations, one per input.
+        """
+        return [self.parse_nl(nl_text) for nl_text in texts]
+    
+    def clear_cache(self):
+        """
+        Clear the cache of parse results.
+        """
+        self.cache = {}
+    
+    def _copy_result(self, result):
+        """
+        Copy a parse result down to its records and relationship dicts.
+        
+        Args:
+            result (dict): Parse result.
+            
+        Returns:
+            dict: Copy of the parse result.
+        """
+        relationships = []
+        for relationship in result["relationships"]:
+            relationship = dict(relationship)
+            if "expressions" in relationship:
+                relationship["expressions"] = list(relationship["expressions"])
+            relationships.append(relationship)
+        
+        return {
+            "intents": [intent.copy() for intent in result["intents"]],
+            "entities": {
+                entity_type: [entity.copy() for entity in entity_list]
+                for entity_type, entity_list in result["entities"].items()
+            },
+            "relationships": relationships,
+            "original_text": result["original_text"]
+        }
+    
+    def _compile_patterns(self, patterns):
+        """
+        Compile pattern strings once for repeated matching.
+        
+        Args:
+            patterns (dict): Pattern strings organized by category.
+            
+        Returns:
+            dict: Lists of (pattern, compiled regex) pairs organized by category.
+        """
+        return {
+            category: [(pattern, re.compile(pattern, re.IGNORECASE)) for pattern in pattern_list]
+            for category, pattern_list in patterns.items()
+        }
+    
+    def _compile_prefilter(self, triggers):
+        """
+        Build the trigger literal prefilter.
+        
+        Args:
+            triggers (dict): Trigger literals organized by category.
+            
+        Returns:
+            tuple: (literal, categories) pairs for each distinct literal, and
+                the set of all categories.
+        """
+        literal_categories = {}
+        for category, literals in triggers.items():
+            for literal in literals:
+                literal_categories.setdefault(literal, set()).add(category)
+        
+        return (
+            [(literal, frozenset(categories)) for literal, categories in literal_categories.items()],
+            frozenset(triggers)
+        )
+    
+    def _find_categories(self, nl_text, prefilter):
+        """
+        Find the categories whose trigger literals occur in the text.
+        
+        Substring checks on the lower-cased text agree with re.IGNORECASE
+        only for ASCII text, so any other text keeps every category.
+        
+        Args:
+            nl_text (str): Natural Language input text.
+            prefilter (tuple): Prefilter built by _compile_prefilter.
+            
+        Returns:
+            set: Categories that may have pattern matches.
+        """
+        literal_categories, all_categories = prefilter
+        if not nl_text.isascii():
+            return all_categories
+        
+        lowered = nl_text.lower()
+        categories = set()
+        for literal, literal_cats in literal_categories:
+            if literal in lowered:
+                categories |= literal_cats
+        return categories
+    
+    def _initialize_triggers(self):
+        """
+        Initialize trigger literals for all parsing stages.
+        
+        Keys are ("intent", category), ("entity", entity type), and
+        ("relationship", literal) for the relationship pattern literals.
+        
+        Returns:
+            dict: Trigger literals organized by stage and category.
+        """
+        triggers = {}
+        for category, literals in self._initialize_intent_triggers().items():
+            triggers[("intent", category)] = literals
+        for entity_type, literals in self._initialize_entity_triggers().items():
+            triggers[("entity", entity_type)] = literals
+        for patterns in (_SEQUENCE_PATTERNS, _PARALLEL_PATTERNS,
+                         _CONDITIONAL_PATTERNS, _REPETITION_PATTERNS):
+            for _, literal in patterns:
+                triggers[("relationship", literal)] = [literal]
+        return triggers
     
     def _initialize_intent_patterns(self):
         """
@@ -127,6 +342,31 @@ class NLParser:
             ]
         }
     
+    def _initialize_intent_triggers(self):
+        """
+        Initialize trigger literals for intent recognition.
+        
+        Every pattern of a category contains at least one of the category's
+        trigger literals, so a category without triggers in the text cannot
+        match.
+        
+        Returns:
+            dict: Trigger literals organized by category.
+        """
+        return {
+            "system_initialization": [" system"],
+            "context_configuration": [" context"],
+            "task_execution": [" task"],
+            "conditional_logic": ["if ", "when ", "on condition "],
+            "parallel_execution": ["simultaneously ", "in parallel ", "concurrently "],
+            "sequential_execution": ["first ", "after ", " followed by "],
+            "repetition": [" times"],
+            "resource_allocation": [" resource"],
+            "security_operations": [" security"],
+            "query_execution": ["query ", "search ", "find "],
+            "batch_operations": ["batch "]
+        }
+    
     def _initialize_entity_patterns(self):
         """
         Initialize patterns for entity extraction.
@@ -173,95 +413,119 @@ class NLParser:
             ]
         }
     
-    def _recognize_intents(self, nl_text):
+    def _initialize_entity_triggers(self):
+        """
+        Initialize trigger literals for entity extraction.
+        
+        Every pattern of an entity type contains at least one of the type's
+        trigger literals.
+        
+        Returns:
+            dict: Trigger literals organized by entity type.
+        """
+        return {
+            "system_type": ["system"],
+            "context_parameter": ["context", "environment"],
+            "task_name": ["task", "operation"],
+            "resource_identifier": ["resource", "allocation"],
+            "condition": ["if ", "when ", "condition "],
+            "action": [
+                "execute ", "run ", "perform ", "do ",
+                "allocate ", "assign ", "reserve ",
+                "apply ", "enforce ", "implement "
+            ],
+            "quantifier": [" times", "repeat ", " iterations"]
+        }
+    
+    def _recognize_intents(self, nl_text, candidates=None):
         """
         Recognize intents in Natural Language text.
         
         Args:
             nl_text (str): Natural Language input text.
+            candidates (set, optional): Prefilter result for the text.
+                Computed if not given.
             
         Returns:
-            list: Recognized intents with categories and details.
+            list: Recognized intents (Intent records) with categories and details.
         """
         recognized_intents = []
+        append = recognized_intents.append
+        
+        # Only categories with a trigger literal in the text can match
+        if candidates is None:
+            candidates = self._find_categories(nl_text, self.prefilter)
         
         # Check each intent category
         for category, patterns in self.intent_patterns.items():
-            for pattern in patterns:
-                matches = re.finditer(pattern, nl_text, re.IGNORECASE)
-                for match in matches:
-                    intent = {
-                        "category": category,
-                        "pattern": pattern,
-                        "match": match.group(0)
-                    }
-                    
-                    # Add captured groups
+            if ("intent", category) not in candidates:
+                continue
+            
+            for pattern, regex in patterns:
+                for match in regex.finditer(nl_text):
+                    # Captured groups are only recorded when present
                     groups = match.groups()
-                    if groups:
-                        intent["groups"] = groups
-                    
-                    recognized_intents.append(intent)
+                    append(Intent(category, pattern, match.group(0), groups or MISSING))
         
         return recognized_intents
     
-    def _extract_entities(self, nl_text, intents):
+    def _extract_entities(self, nl_text, intents, candidates=None):
         """
         Extract entities from Natural Language text.
         
         Args:
             nl_text (str): Natural Language input text.
             intents (list): Recognized intents.
+            candidates (set, optional): Prefilter result for the text.
+                Computed if not given.
             
         Returns:
-            dict: Extracted entities organized by type.
+            dict: Extracted entities (Entity records) organized by type.
         """
-        entities = {}
+        entities = {entity_type: [] for entity_type in self.entity_patterns}
+        
+        # Only entity types with a trigger literal in the text can match
+        if candidates is None:
+            candidates = self._find_categories(nl_text, self.prefilter)
         
         # Check each entity type
         for entity_type, patterns in self.entity_patterns.items():
-            entities[entity_type] = []
+            if ("entity", entity_type) not in candidates:
+                continue
             
-            for pattern in patterns:
-                matches = re.finditer(pattern, nl_text, re.IGNORECASE)
-                for match in matches:
-                    entity = {
-                        "type": entity_type,
-                        "pattern": pattern,
-                        "match": match.group(0)
-                    }
-                    
-                    # Add captured groups
+            append = entities[entity_type].append
+            for pattern, regex in patterns:
+                for match in regex.finditer(nl_text):
+                    # Usually the last group contains the entity value
                     groups = match.groups()
-                    if groups:
-                        entity["value"] = groups[-1]  # Usually the last group contains the entity value
-                    
-                    entities[entity_type].append(entity)
+                    append(Entity(entity_type, pattern, match.group(0), groups[-1] if groups else MISSING))
         
         return entities
     
-    def _extract_relationships(self, nl_text, entities):
+    def _extract_relationships(self, nl_text, entities, candidates=None):
         """
         Extract relationships between entities.
         
         Args:
             nl_text (str): Natural Language input text.
             entities (dict): Extracted entities.
+            candidates (set, optional): Prefilter result for the text.
+                Computed if not given.
             
         Returns:
             list: Extracted relationships.
         """
         relationships = []
         
+        # Only patterns whose literal occurs in the text can match
+        if candidates is None:
+            candidates = self._find_categories(nl_text, self.prefilter)
+        
         # Extract sequence relationships
-        sequence_patterns = [
-            r"(.+?) then (.+)",
-            r"(.+?) followed by (.+)",
-            r"after (.+?) do (.+)"
-        ]
-        
-        for pattern in sequence_patterns:
-            matches = re.finditer(pattern, nl_text, re.IGNORECASE)
+        for regex, literal in _SEQUENCE_PATTERNS:
+            if ("relationship", literal) not in candidates:
+                continue
+            matches = regex.finditer(nl_text)
             for match in matches:
                 relationships.append({
                     "type": "sequence",
@@ -271,14 +535,10 @@ class NLParser:
                 })
         
         # Extract parallel relationships
-        parallel_patterns = [
-            r"(.+?) and (.+?) simultaneously",
-            r"(.+?) in parallel with (.+?)",
-            r"concurrently (.+?) and (.+?)"
-        ]
-        
-        for pattern in parallel_patterns:
-            matches = re.finditer(pattern, nl_text, re.IGNORECASE)
+        for regex, literal in _PARALLEL_PATTERNS:
+            if ("relationship", literal) not in candidates:
+                continue
+            matches = regex.finditer(nl_text)
             for match in matches:
                 relationships.append({
                     "type": "parallel",
@@ -287,13 +547,10 @@ class NLParser:
                 })
         
         # Extract conditional relationships
-        conditional_patterns = [
-            r"if (.+?) then (.+?)(?: else (.+))?",
-            r"when (.+?) do (.+?)(?: otherwise (.+))?"
-        ]
-        
-        for pattern in conditional_patterns:
-            matches = re.finditer(pattern, nl_text, re.IGNORECASE)
+        for regex, literal in _CONDITIONAL_PATTERNS:
+            if ("relationship", literal) not in candidates:
+                continue
+            matches = regex.finditer(nl_text)
             for match in matches:
                 relationship = {
                     "type": "conditional",
@@ -309,13 +566,10 @@ class NLParser:
                 relationships.append(relationship)
         
         # Extract repetition relationships
-        repetition_patterns = [
-            r"repeat (.+?) (\d+) times",
-            r"do (.+?) (\d+) times"
-        ]
-        
-        for pattern in repetition_patterns:
-            matches = re.finditer(pattern, nl_text, re.IGNORECASE)
+        for regex, literal in _REPETITION_PATTERNS:
+            if ("relationship", literal) not in candidates:
+                continue
+            matches = regex.finditer(nl_text)
             for match in matches:
                 relationships.append({
                     "type": "repetition",
@@ -325,3 +579,19 @@ class NLParser:
                 })
         
         return relationships
+
+
+# Shared parser instance returned by get_nl_parser()
+_DEFAULT_NL_PARSER = None
+
+def get_nl_parser():
+    """
+    Get the shared NL parser instance.
+    
+    Returns:
+        NLParser: The shared parser instance, created on first use.
+    """
+    global _DEFAULT_NL_PARSER
+    if _DEFAULT_NL_PARSER is None:
+        _DEFAULT_NL_PARSER = NLParser()
+    return _DEFAULT_NL_PARSER
@@ -0,0 +1,89 @@
+"""
+Record types shared by the compiler components.
+
+This module provides the base for the slotted records that the parser
+and the semantic analyzer produce in place of per-entry dicts.
+"""
+
+from collections.abc import Mapping
+
+# Marker for optional record fields that are not set
+MISSING = object()
+
+class Record(Mapping):
+    """
+    Base for slotted records with dict-style read access.
+    
+    Records are Mappings of their set fields. Subclasses list
+    their readable fields in _fields. Optional fields that are not set
+    hold MISSING and behave like missing dict keys, so
+    record.get("falseBranch") and "source" in record work as they did
+    for the dicts these records replace. Records are not dict instances;
+    use to_dict() where a real dict is needed, e.g. for json.dumps.
+    """
+    
+    __slots__ = ()
+    
+    # Field names readable through the dict-style interface, in key order
+    _fields = ()
+    
+    def __getitem__(self, key):
+        value = getattr(self, key) if key in self._fields else MISSING
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+    
+    def __contains__(self, key):
+        return key in self._fields and getattr(self, key) is not MISSING
+    
+    def __iter__(self):
+        for key in self._fields:
+            if getattr(self, key) is not MISSING:
+                yield key
+    
+    def __len__(self):
+        return sum(1 for key in self)
+    
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, key) == getattr(other, key) for key in self._fields)
+    
+    def __repr__(self):
+        fields = ", ".join(f"{key}={value!r}" for key, value in self.items())
+        return f"{type(self).__name__}({fields})"
+    
+    def get(self, key, default=None):
+        """
+        Get a field value by name.
+        
+        Args:
+            key (str): Field name.
+            default: Value returned for unknown or unset fields.
+            
+        Returns:
+            The field value, or default.
+        """
+        value = getattr(self, key) if key in self._fields else MISSING
+        return default if value is MISSING else value
+    
+    def copy(self):
+        """
+        Create a shallow copy of the record.
+        
+        Returns:
+            Record: New record of the same type with the same field values.
+        """
+        clone = object.__new__(type(self))
+        for key in type(self).__slots__:
+            setattr(clone, key, getattr(self, key))
+        return clone
+    
+    def to_dict(self):
+        """
+        Convert the record to a plain dict of its set fields.
+        
+        Returns:
+            dict: Dict representation of the record.
+        """
+        return {key: getattr(self, key) for key in self}
@@ -26,7 +26,9 @@ class SemanticAnalyzer:
         self.token_dictionary = token_dictionary or {}
         self.token_registry_path = token_registry_path
         self.token_id_generator = TokenIDGenerator(token_registry_path)
-        self.mapping_utils = MappingUtils(self.token_dictionary, token_registry_path)
+        self.mapping_utils = MappingUtils(
+            self.token_dictionary, token_registry_path, self.token_id_generator
+        )
         self.nl_analyzer = NLAnalyzer(self.mapping_utils)
         self.cl_analyzer = CLAnalyzer(self.mapping_utils)
     
@@ -41,11 +43,17 @@ class SemanticAnalyzer:
             dict: Semantic analysis with pAI_Lang mappings.
         """
         input_type = parsed_input.get("type", "NL")
+        content = parsed_input.get("content", {})
         
         if input_type == "CL":
-            return self.cl_analyzer.analyze_cl(parsed_input.get("content", {}))
+            semantic_analysis = self.cl_analyzer.analyze_cl(content)
         else:  # Default to NL
-            return self.nl_analyzer.analyze_nl(parsed_input.get("content", {}))
+            semantic_analysis = self.nl_analyzer.analyze_nl(content)
+        
+        # Save the tokens this analysis added, once
+        self.token_id_generator.flush()
+        
+        return semantic_analysis
     
     def get_token_id(self, value, category):
         """
@@ -58,7 +66,9 @@ class SemanticAnalyzer:
         Returns:
             str: The token ID.
         """
-        return self.token_id_generator.get_token_id(value, category)
+        token = self.token_id_generator.get_token_id(value, category)
+        self.token_id_generator.flush()
+        return token
     
     def register_token(self, value, category, token_id):
         """
@@ -72,7 +82,9 @@ class SemanticAnalyzer:
         Returns:
             bool: True if registration was successful, False otherwise.
         """
-        return self.token_id_generator.register_token(value, category, token_id)
+        registered = self.token_id_generator.register_token(value, category, token_id)
+        self.token_id_generator.flush()
+        return registered
     
     def get_value_from_token(self, token):
         """
@@ -5,6 +5,13 @@ This module provides functionality for analyzing the semantic meaning of parsed
 Command Language (CL) inputs and mapping them to pAI_Lang concepts.
 """
 
+from types import MappingProxyType
+
+from pailang_tooling.compiler.semantic_analyzer.records import Relationship
+
+# Shared default for commands without parameters
+_NO_PARAMETERS = MappingProxyType({})
+
 class CLAnalyzer:
     """
     Analyzes the semantic meaning of parsed Command Language inputs.
@@ -18,6 +25,14 @@ class CLAnalyzer:
             mapping_utils (MappingUtils): Utility functions for mapping operations.
         """
         self.mapping_utils = mapping_utils
+        
+        # Relationship builders by command name; other commands relate
+        # their children in sequence
+        self._relationship_handlers = {
+            "CONDITIONAL": self._add_conditional_relationship,
+            "PARALLEL": self._add_parallel_relationship,
+            "REPEAT": self._add_repetition_relationship
+        }
     
     def analyze_cl(self, cl_content):
         """
@@ -33,11 +48,25 @@ class CLAnalyzer:
         commands = cl_content.get("commands", [])
         hierarchy = cl_content.get("hierarchy", [])
         
-        # Map commands to pAI_Lang tokens
-        token_mappings = self.mapping_utils.map_commands_to_tokens(commands)
+        # No commands: skip the mapping passes
+        if not commands and not hierarchy:
+            return {
+                "token_mappings": {},
+                "operator_mappings": {},
+                "semantic_structure": {
+                    "type": "Expression",
+                    "tokens": [],
+                    "operators": [],
+                    "relationships": []
+                },
+                "original_content": cl_content
+            }
         
-        # Map command hierarchy to pAI_Lang operators
-        operator_mappings = self.mapping_utils.map_hierarchy_to_operators(hierarchy)
+        # Map commands to pAI_Lang tokens and the command hierarchy to
+        # pAI_Lang operators in a single walk
+        token_mappings, operator_mappings = self.mapping_utils.map_commands_and_hierarchy(
+            commands, hierarchy
+        )
         
         # Build semantic structure
         semantic_structure = self.build_cl_semantic_structure(
@@ -63,31 +92,29 @@ class CLAnalyzer:
         Returns:
             dict: Semantic structure.
         """
-        # Start with empty structure
+        # Start with the tokens and operators; relationships follow
         structure = {
             "type": "Expression",
-            "tokens": [],
-            "operators": [],
+            "tokens": [
+                {
+                    "token": token_info["token"],
+                    "category": token_info["category"],
+                    "id": token_info["id"],
+                    "source": command_line
+                }
+                for command_line, token_info in token_mappings.items()
+            ],
+            "operators": [
+                {
+                    "operator": operator_info["operator"],
+                    "type": operator_info["type"],
+                    "source": command_line
+                }
+                for command_line, operator_info in operator_mappings.items()
+            ],
             "relationships": []
         }
         
-        # Add tokens
-        for command_line, token_info in token_mappings.items():
-            structure["tokens"].append({
-                "token": token_info["token"],
-                "category": token_info["category"],
-                "id": token_info["id"],
-                "source": command_line
-            })
-        
-        # Add operators
-        for command_line, operator_info in operator_mappings.items():
-            structure["operators"].append({
-                "operator": operator_info["operator"],
-                "type": operator_info["type"],
-                "source": command_line
-            })
-        
         # Build relationships from hierarchy
         structure["relationships"] = self.build_relationships_from_hierarchy(hierarchy, token_mappings)
         
@@ -106,91 +133,147 @@ class CLAnalyzer:
         """
         relationships = []
         
+        # Resolve command lines to tokens once for the whole walk
+        line_to_token = self._index_tokens(token_mappings)
+        
         # Process each command in hierarchy
         for command_node in hierarchy:
-            self.process_relationships(command_node, relationships, token_mappings)
+            self._walk_relationships(command_node, relationships, line_to_token)
         
         return relationships
     
+    @staticmethod
+    def _index_tokens(token_mappings):
+        """
+        Index tokens by the command line they were generated from.
+        
+        Args:
+            token_mappings (dict): Mappings from commands to tokens.
+            
+        Returns:
+            dict: Mapping from command line to token.
+        """
+        return {line: token_info.get("token") for line, token_info in token_mappings.items()}
+    
     def process_relationships(self, command_node, relationships, token_mappings):
         """
-        Process relationships for a command node.
+        Process relationships for a command node and its descendants.
         
         Args:
             command_node (dict): Command node.
             relationships (list): Relationships to update.
             token_mappings (dict): Mappings from commands to tokens.
         """
-        command_name = command_node.get("name", "")
-        children = command_node.get("children", [])
-        
-        # Skip if no children
-        if not children:
-            return
-        
-        # Get token for this command
-        command_token = token_mappings.get(command_node["line"], {}).get("token")
-        
-        # Get tokens for children
-        child_tokens = []
-        for child in children:
-            child_token = token_mappings.get(child["line"], {}).get("token")
-            if child_token:
-                child_tokens.append({
-                    "token": child_token,
-                    "node": child
-                })
-        
-        # Create relationship based on command type
-        if command_name == "CONDITIONAL" and len(child_tokens) >= 1:
-            # Conditional relationship
-            relationship = {
-                "type": "conditional",
-                "operator": "?:",
-                "condition": command_token,
-                "trueBranch": child_tokens[0]["token"]
-            }
+        self._walk_relationships(command_node, relationships, self._index_tokens(token_mappings))
+    
+    def _walk_relationships(self, command_node, relationships, line_to_token):
+        """
+        Walk a command subtree and collect its relationships.
+        
+        The subtree is walked in pre-order with an explicit stack, so deep
+        hierarchies do not hit the recursion limit.
+        
+        Args:
+            command_node (dict): Command node.
+            relationships (list): Relationships to update.
+            line_to_token (dict): Mapping from command line to token.
+        """
+        get_token = line_to_token.get
+        
+        # Each stack entry carries the node's resolved token, so a child's
+        # token is looked up once and reused when the child is processed
+        stack = [(command_node, get_token(command_node["line"]))]
+        pop = stack.pop
+        push = stack.extend
+        append = relationships.append
+        get_handler = self._relationship_handlers.get
+        add_sequence = self._add_sequence_relationship
+        
+        while stack:
+            command_node, command_token = pop()
+            children = command_node.get("children", ())
             
-            # Add false branch if present
-            if len(child_tokens) >= 2:
-                relationship["falseBranch"] = child_tokens[1]["token"]
+            # Skip if no children
+            if not children:
+                continue
             
-            relationships.append(relationship)
-        
-        elif command_name == "PARALLEL" and child_tokens:
-            # Parallel relationship
-            relationship = {
-                "type": "parallel",
-                "operator": "&",
-                "expressions": [token_info["token"] for token_info in child_tokens]
-            }
+            # Get tokens for children
+            resolved = []
+            child_tokens = []
+            for child in children:
+                child_token = get_token(child["line"])
+                resolved.append((child, child_token))
+                if child_token:
+                    child_tokens.append(child_token)
             
-            relationships.append(relationship)
-        
-        elif command_name == "REPEAT" and child_tokens:
-            # Repetition relationship
-            count = command_node.get("parameters", {}).get("count", "1")
-            relationship = {
-                "type": "repetition",
-                "operator": "**",
-                "expression": child_tokens[0]["token"],
-                "count": count
-            }
+            # Create relationship based on command type
+            if child_tokens:
+                handler = get_handler(command_node.get("name", ""), add_sequence)
+                handler(command_node, command_token, child_tokens, append)
             
-            relationships.append(relationship)
-        
-        elif len(child_tokens) >= 2:
-            # Sequence relationship for adjacent children
-            for i in range(len(child_tokens) - 1):
-                relationship = {
-                    "type": "sequence",
-                    "operator": ">",
-                    "source": child_tokens[i]["token"],
-                    "target": child_tokens[i + 1]["token"]
-                }
-                
-                relationships.append(relationship)
+            # Visit children next, first child on top of the stack
+            push(reversed(resolved))
+    
+    def _add_conditional_relationship(self, command_node, command_token, child_tokens, append):
+        """
+        Add the conditional relationship of a CONDITIONAL command.
         
-        # Process children recursively
-        for child in children:
-            self.process_relationships(child, relationships, token_mappings)
+        Args:
+            command_node (dict): Command node.
+            command_token (str): Token of the command.
+            child_tokens (list): Tokens of the command's children.
+            append (callable): Appends a relationship to the result.
+        """
+        relationship = Relationship(
+            "conditional", "?:",
+            condition=command_token,
+            trueBranch=child_tokens[0]
+        )
+        
+        # Add false branch if present
+        if len(child_tokens) >= 2:
+            relationship.falseBranch = child_tokens[1]
+        
+        append(relationship)
+    
+    def _add_parallel_relationship(self, command_node, command_token, child_tokens, append):
+        """
+        Add the parallel relationship of a PARALLEL command.
+        
+        Args:
+            command_node (dict): Command node.
+            command_token (str): Token of the command.
+            child_tokens (list): Tokens of the command's children.
+            append (callable): Appends a relationship to the result.
+        """
+        append(Relationship("parallel", "&", expressions=child_tokens))
+    
+    def _add_repetition_relationship(self, command_node, command_token, child_tokens, append):
+        """
+        Add the repetition relationship of a REPEAT command.
+        
+        Args:
+            command_node (dict): Command node.
+            command_token (str): Token of the command.
+            child_tokens (list): Tokens of the command's children.
+            append (callable): Appends a relationship to the result.
+        """
+        count = command_node.get("parameters", _NO_PARAMETERS).get("count", "1")
+        append(Relationship(
+            "repetition", "**",
+            expression=child_tokens[0],
+            count=count
+        ))
+    
+    def _add_sequence_relationship(self, command_node, command_token, child_tokens, append):
+        """
+        Add sequence relationships between adjacent children of a command.
+        
+        Args:
+            command_node (dict): Command node.
+            command_token (str): Token of the command.
+            child_tokens (list): Tokens of the command's children.
+            append (callable): Appends a relationship to the result.
+        """
+        for source, target in zip(child_tokens, child_tokens[1:]):
+            append(Relationship("sequence", ">", source=source, target=target))
@@ -5,24 +5,96 @@ This module provides utility functions for mapping operations between
 different language representations and pAI_Lang concepts.
 """
 
+from types import MappingProxyType
+
+from pailang_tooling.compiler.semantic_analyzer.records import TokenMapping
 from pailang_tooling.compiler.semantic_analyzer.token_id_generator import TokenIDGenerator
 
+# Intent categories to pAI_Lang categories
+_INTENT_CATEGORY = MappingProxyType({
+    "system_initialization": "system",
+    "context_configuration": "context",
+    "task_execution": "task",
+    "conditional_logic": "condition",
+    "parallel_execution": "action",
+    "sequential_execution": "action",
+    "repetition": "action",
+    "resource_allocation": "resource",
+    "security_operations": "system",
+    "query_execution": "query",
+    "batch_operations": "batch"
+})
+
+# Entity types to pAI_Lang categories
+_ENTITY_CATEGORY = MappingProxyType({
+    "system_type": "system",
+    "context_parameter": "context",
+    "task_name": "task",
+    "resource_identifier": "resource",
+    "condition": "condition",
+    "action": "action",
+    "quantifier": "action"
+})
+
+# Command names to pAI_Lang categories
+_COMMAND_CATEGORY = MappingProxyType({
+    "INITIALIZE": "system",
+    "SET_CONTEXT": "context",
+    "EXECUTE": "task",
+    "EXECUTE_TASK": "task",
+    "CONDITIONAL": "condition",
+    "PARALLEL": "action",
+    "REPEAT": "action",
+    "BATCH_OPERATION": "batch",
+    "ACTIVATE_CONTEXT": "context",
+    "ALLOCATE_RESOURCE": "resource",
+    "APPLY_SECURITY": "system",
+    "EXECUTE_QUERY": "query"
+})
+
+# pAI_Lang categories to the name of their key command parameter
+_CATEGORY_PARAM = MappingProxyType({
+    "system": "SYSTEM",
+    "context": "CONTEXT",
+    "task": "TASK",
+    "condition": "CONDITION",
+    "action": "PROCESS",
+    "resource": "RESOURCE",
+    "query": "QUERY",
+    "batch": "BATCH"
+})
+
+# Shared default for commands without parameters
+_NO_PARAMETERS = MappingProxyType({})
+
+# Relationship types to pAI_Lang operators
+_REL_OP = MappingProxyType({
+    "sequence": ">",
+    "parallel": "&",
+    "conditional": "?:",
+    "repetition": "**"
+})
+
 class MappingUtils:
     """
     Utility functions for mapping operations.
     """
     
-    def __init__(self, token_dictionary=None, token_registry_path=None):
+    def __init__(self, token_dictionary=None, token_registry_path=None, token_id_generator=None):
         """
         Initialize the mapping utilities.
         
         Args:
             token_dictionary (dict, optional): Dictionary of token definitions.
             token_registry_path (str, optional): Path to token registry file.
+            token_id_generator (TokenIDGenerator, optional): Shared token ID
+                generator. If None, one is created for token_registry_path.
         """
         self.token_dictionary = token_dictionary or {}
         self.category_mappings = self._initialize_category_mappings()
-        self.token_id_generator = TokenIDGenerator(token_registry_path)
+        if token_id_generator is None:
+            token_id_generator = TokenIDGenerator(token_registry_path)
+        self.token_id_generator = token_id_generator
     
     def _initialize_category_mappings(self):
         """
@@ -31,19 +103,7 @@ class MappingUtils:
         Returns:
             dict: Category mappings.
         """
-        return {
-            "system_initialization": "system",
-            "context_configuration": "context",
-            "task_execution": "task",
-            "conditional_logic": "condition",
-            "parallel_execution": "action",
-            "sequential_execution": "action",
-            "repetition": "action",
-            "resource_allocation": "resource",
-            "security_operations": "system",
-            "query_execution": "query",
-            "batch_operations": "batch"
-        }
+        return dict(_INTENT_CATEGORY)
     
     def map_intents_to_categories(self, intents):
         """
@@ -82,54 +142,28 @@ class MappingUtils:
             dict: Mappings from entities to tokens.
         """
         token_mappings = {}
+        generate_token_id = self.token_id_generator.generate_token_id
         
         # Process each entity type
         for entity_type, entity_list in entities.items():
+            # Determine category based on entity type
+            category = _ENTITY_CATEGORY.get(entity_type, "directive")
+            
             for entity in entity_list:
-                # Determine category based on entity type
-                category = self._get_category_for_entity_type(entity_type)
-                
                 # Generate token ID using the token ID generator
-                token = self.token_id_generator.generate_token_id(entity.get("value", ""), category)
+                token = generate_token_id(entity.get("value", ""), category)
                 
-                # Extract category prefix and ID
-                category_prefix = token[0]
+                # Extract the ID (the token minus its category prefix)
                 token_id = token[1:]
                 
                 # Create token mapping
-                token_mappings[entity["match"]] = {
-                    "token": token,
-                    "category": category,
-                    "id": token_id,
-                    "original_entity": entity,
-                    "pailang_token": token  # For compatibility with existing code
-                }
+                token_mappings[entity["match"]] = TokenMapping(
+                    token, category, token_id,
+                    original_entity=entity
+                )
         
         return token_mappings
     
-    def _get_category_for_entity_type(self, entity_type):
-        """
-        Get pAI_Lang category for entity type.
-        
-        Args:
-            entity_type (str): Entity type.
-            
-        Returns:
-            str: pAI_Lang category.
-        """
-        # Map entity types to categories
-        entity_type_map = {
-            "system_type": "system",
-            "context_parameter": "context",
-            "task_name": "task",
-            "resource_identifier": "resource",
-            "condition": "condition",
-            "action": "action",
-            "quantifier": "action"
-        }
-        
-        return entity_type_map.get(entity_type, "directive")
-    
     def map_relationships_to_operators(self, relationships):
         """
         Map relationships to pAI_Lang operators.
@@ -141,21 +175,11 @@ class MappingUtils:
             dict: Mappings from relationships to operators.
         """
         operator_mappings = {}
+        op_get = _REL_OP.get
         
         for relationship in relationships:
-            rel_type = relationship.get("type")
-            
-            # Map relationship types to operators
-            if rel_type == "sequence":
-                operator = ">"
-            elif rel_type == "parallel":
-                operator = "&"
-            elif rel_type == "conditional":
-                operator = "?:"
-            elif rel_type == "repetition":
-                operator = "**"
-            else:
-                operator = ">"  # Default to sequence
+            # Map relationship types to operators (default to sequence)
+            operator = op_get(relationship.get("type"), ">")
             
             # Store mapping
             operator_mappings[relationship["type"]] = {
@@ -176,149 +200,174 @@ class MappingUtils:
             dict: Mappings from commands to tokens.
         """
         token_mappings = {}
+        generate_token_id = self.token_id_generator.generate_token_id
+        cat_get = _COMMAND_CATEGORY.get
+        param_get = _CATEGORY_PARAM.get
         
         for command in commands:
             command_name = command.get("name", "")
             
             # Determine category based on command name
-            category = self._get_category_for_command(command_name)
+            category = cat_get(command_name, "directive")
             
             # Extract key parameter value
-            param_key = self._get_key_param_for_category(category)
-            param_value = command.get("parameters", {}).get(param_key, "")
+            param_key = param_get(category, "ID")
+            param_value = command.get("parameters", _NO_PARAMETERS).get(param_key, "")
             
             # Generate token using the token ID generator
-            token = self.token_id_generator.generate_token_id(param_value, category)
+            token = generate_token_id(param_value, category)
             
-            # Extract category prefix and ID
-            category_prefix = token[0]
+            # Extract the ID (the token minus its category prefix)
             token_id = token[1:]
             
             # Create token mapping
-            token_mappings[command["line"]] = {
-                "token": token,
-                "category": category,
-                "id": token_id,
-                "original_command": command,
-                "pailang_token": token  # For compatibility with existing code
-            }
+            token_mappings[command["line"]] = TokenMapping(
+                token, category, token_id,
+                original_command=command
+            )
         
         return token_mappings
     
-    def _get_category_for_command(self, command_name):
+    def map_hierarchy_to_operators(self, hierarchy):
         """
-        Get pAI_Lang category for command name.
+        Map command hierarchy to pAI_Lang operators.
         
         Args:
-            command_name (str): Command name.
+            hierarchy (list): Command hierarchy.
             
         Returns:
-            str: pAI_Lang category.
-        """
-        # Map command names to categories
-        command_map = {
-            "INITIALIZE": "system",
-            "SET_CONTEXT": "context",
-            "EXECUTE": "task",
-            "EXECUTE_TASK": "task",
-            "CONDITIONAL": "condition",
-            "PARALLEL": "action",
-            "REPEAT": "action",
-            "BATCH_OPERATION": "batch",
-            "ACTIVATE_CONTEXT": "context",
-            "ALLOCATE_RESOURCE": "resource",
-            "APPLY_SECURITY": "system",
-            "EXECUTE_QUERY": "query"
-        }
-        
-        return command_map.get(command_name, "directive")
-    
-    def _get_key_param_for_category(self, category):
+            dict: Mappings from hierarchy to operators.
         """
-        Get key parameter name for category.
+        operator_mappings = {}
         
-        Args:
-            category (str): pAI_Lang category.
-            
-        Returns:
-            str: Key parameter name.
-        """
-        # Map categories to key parameter names
-        category_param_map = {
-            "system": "SYSTEM",
-            "context": "CONTEXT",
-            "task": "TASK",
-            "condition": "CONDITION",
-            "action": "PROCESS",
-            "resource": "RESOURCE",
-            "query": "QUERY",
-            "batch": "BATCH"
-        }
+        # Process each command in hierarchy
+        self._walk_hierarchy(hierarchy, operator_mappings)
         
-        return category_param_map.get(category, "ID")
+        return operator_mappings
     
-    def map_hierarchy_to_operators(self, hierarchy):
+    def map_commands_and_hierarchy(self, commands, hierarchy):
         """
-        Map command hierarchy to pAI_Lang operators.
+        Map commands to tokens and the hierarchy to operators in one walk.
+        
+        When the hierarchy nodes are the commands themselves, as produced
+        by the CL parser, its pre-order walk visits them in command order,
+        so both mappings are filled during the same traversal. Otherwise
+        the tokens are mapped from the command list separately.
         
         Args:
+            commands (list): Parsed commands.
             hierarchy (list): Command hierarchy.
             
         Returns:
-            dict: Mappings from hierarchy to operators.
+            tuple: (token_mappings, operator_mappings).
         """
+        token_mappings = {}
         operator_mappings = {}
         
-        # Process each command in hierarchy
-        for command_node in hierarchy:
-            self._process_command_node(command_node, operator_mappings)
+        matched = self._walk_hierarchy(hierarchy, operator_mappings, None, commands, token_mappings)
         
-        return operator_mappings
+        # Hierarchy does not mirror the command list; map the commands directly
+        if matched != len(commands):
+            token_mappings = self.map_commands_to_tokens(commands)
+        
+        return token_mappings, operator_mappings
     
     def _process_command_node(self, command_node, operator_mappings, parent=None):
         """
-        Process a command node in the hierarchy.
+        Process a command node and its descendants in the hierarchy.
         
         Args:
             command_node (dict): Command node.
             operator_mappings (dict): Operator mappings to update.
             parent (dict, optional): Parent command node.
         """
-        command_name = command_node.get("name", "")
-        children = command_node.get("children", [])
+        self._walk_hierarchy((command_node,), operator_mappings, parent)
+    
+    def _walk_hierarchy(self, nodes, operator_mappings, parent=None, commands=None, token_mappings=None):
+        """
+        Walk command subtrees and map them to operators.
         
-        # Map command type to operator
-        if command_name == "CONDITIONAL":
-            # Conditional operator
-            operator_mappings[command_node["line"]] = {
-                "operator": "?:",
-                "type": "conditional",
-                "original_command": command_node
-            }
-        elif command_name == "PARALLEL":
-            # Parallel operator
-            operator_mappings[command_node["line"]] = {
-                "operator": "&",
-                "type": "parallel",
-                "original_command": command_node
-            }
-        elif command_name == "REPEAT":
-            # Repetition operator
-            count = command_node.get("parameters", {}).get("count", "1")
-            operator_mappings[command_node["line"]] = {
-                "operator": "**",
-                "type": "repetition",
-                "count": count,
-                "original_command": command_node
-            }
-        elif parent and children:
-            # Sequence operator (parent with children)
-            operator_mappings[command_node["line"]] = {
-                "operator": ">",
-                "type": "sequence",
-                "original_command": command_node
-            }
+        The subtrees are walked in pre-order with an explicit stack, so deep
+        hierarchies do not hit the recursion limit. If commands and
+        token_mappings are given, each visited node is also mapped to a
+        token for as long as the visit order matches the command list.
+        
+        Args:
+            nodes (list): Root command nodes of the subtrees.
+            operator_mappings (dict): Operator mappings to update.
+            parent (dict, optional): Parent of the root command nodes.
+            commands (list, optional): Parsed commands, in order.
+            token_mappings (dict, optional): Token mappings to update.
+            
+        Returns:
+            int: Number of leading commands mapped to tokens, or -1 if the
+                visit order diverged from the command list.
+        """
+        stack = [(command_node, parent) for command_node in reversed(nodes)]
+        pop = stack.pop
+        push = stack.extend
+        
+        # Token mapping state for the fused walk
+        matched = 0
+        if commands is not None:
+            command_count = len(commands)
+            generate_token_id = self.token_id_generator.generate_token_id
+            cat_get = _COMMAND_CATEGORY.get
+            param_get = _CATEGORY_PARAM.get
+        
+        while stack:
+            command_node, parent = pop()
+            command_name = command_node.get("name", "")
+            children = command_node.get("children", ())
+            
+            # Map the command to a token while the walk follows the command list
+            if commands is not None:
+                if matched < command_count and commands[matched] is command_node:
+                    category = cat_get(command_name, "directive")
+                    param_value = command_node.get("parameters", _NO_PARAMETERS).get(param_get(category, "ID"), "")
+                    token = generate_token_id(param_value, category)
+                    token_mappings[command_node["line"]] = TokenMapping(
+                        token, category, token[1:],
+                        original_command=command_node
+                    )
+                    matched += 1
+                else:
+                    commands = None
+                    matched = -1
+            
+            # Map command type to operator
+            if command_name == "CONDITIONAL":
+                # Conditional operator
+                operator_mappings[command_node["line"]] = {
+                    "operator": "?:",
+                    "type": "conditional",
+                    "original_command": command_node
+                }
+            elif command_name == "PARALLEL":
+                # Parallel operator
+                operator_mappings[command_node["line"]] = {
+                    "operator": "&",
+                    "type": "parallel",
+                    "original_command": command_node
+                }
+            elif command_name == "REPEAT":
+                # Repetition operator
+                count = command_node.get("parameters", _NO_PARAMETERS).get("count", "1")
+                operator_mappings[command_node["line"]] = {
+                    "operator": "**",
+                    "type": "repetition",
+                    "count": count,
+                    "original_command": command_node
+                }
+            elif parent and children:
+                # Sequence operator (parent with children)
+                operator_mappings[command_node["line"]] = {
+                    "operator": ">",
+                    "type": "sequence",
+                    "original_command": command_node
+                }
+            
+            # Visit children next, first child on top of the stack
+            push((child, command_node) for child in reversed(children))
         
-        # Process children recursively
-        for child in children:
-            self._process_command_node(child, operator_mappings, command_node)
+        return matched
@@ -34,6 +34,21 @@ class NLAnalyzer:
         entities = nl_content.get("entities", {})
         relationships = nl_content.get("relationships", [])
         
+        # Nothing recognized: skip the mapping passes
+        if not intents and not relationships and not any(entities.values()):
+            return {
+                "category_mappings": {},
+                "token_mappings": {},
+                "operator_mappings": {},
+                "semantic_structure": {
+                    "type": "Expression",
+                    "tokens": [],
+                    "operators": [],
+                    "relationships": []
+                },
+                "original_content": nl_content
+            }
+        
         # Map intents to pAI_Lang categories
         category_mappings = self.mapping_utils.map_intents_to_categories(intents)
         
@@ -68,38 +83,37 @@ class NLAnalyzer:
         Returns:
             dict: Semantic structure.
         """
-        # Start with empty structure
+        # Start with the tokens and operators; relationships follow
         structure = {
             "type": "Expression",
-            "tokens": [],
-            "operators": [],
+            "tokens": [
+                {
+                    "token": token_info["token"],
+                    "category": token_info["category"],
+                    "id": token_info["id"],
+                    "source": entity_match
+                }
+                for entity_match, token_info in token_mappings.items()
+            ],
+            "operators": [
+                {
+                    "operator": operator_info["operator"],
+                    "type": rel_type,
+                    "source": operator_info["original_relationship"]
+                }
+                for rel_type, operator_info in operator_mappings.items()
+            ],
             "relationships": []
         }
         
-        # Add tokens
-        for entity_match, token_info in token_mappings.items():
-            structure["tokens"].append({
-                "token": token_info["token"],
-                "category": token_info["category"],
-                "id": token_info["id"],
-                "source": entity_match
-            })
-        
-        # Add operators
-        for rel_type, operator_info in operator_mappings.items():
-            structure["operators"].append({
-                "operator": operator_info["operator"],
-                "type": rel_type,
-                "source": operator_info["original_relationship"]
-            })
-        
         # Add relationships
+        append = structure["relationships"].append
         for relationship in operator_mappings.values():
             rel = relationship["original_relationship"]
             
             if "source" in rel and "target" in rel:
                 # Sequence relationship
-                structure["relationships"].append({
+                append({
                     "type": "binary",
                     "operator": relationship["operator"],
                     "source": rel["source"],
@@ -107,7 +121,7 @@ class NLAnalyzer:
                 })
             elif "expressions" in rel:
                 # Parallel relationship
-                structure["relationships"].append({
+                append({
                     "type": "binary",
                     "operator": relationship["operator"],
                     "expressions": rel["expressions"]
@@ -124,10 +138,10 @@ class NLAnalyzer:
                 if "falseBranch" in rel:
                     conditional["falseBranch"] = rel["falseBranch"]
                 
-                structure["relationships"].append(conditional)
+                append(conditional)
             elif "expression" in rel and "count" in rel:
                 # Repetition relationship
-                structure["relationships"].append({
+                append({
                     "type": "repetition",
                     "operator": relationship["operator"],
                     "expression": rel["expression"],
@@ -0,0 +1,62 @@
+"""
+Record types for the Semantic Analyzer component.
+
+This module provides the slotted records used for semantic analysis
+results in place of per-entry dicts.
+"""
+
+from pailang_tooling.compiler.records import MISSING, Record
+
+class Relationship(Record):
+    """
+    Relationship between command tokens in a CL semantic structure.
+    
+    Each relationship type sets only its own fields.
+    """
+    
+    __slots__ = (
+        "type", "operator", "condition", "trueBranch", "falseBranch",
+        "expressions", "expression", "count", "source", "target"
+    )
+    _fields = __slots__
+    
+    def __init__(self, type, operator, condition=MISSING, trueBranch=MISSING,
+                 falseBranch=MISSING, expressions=MISSING, expression=MISSING,
+                 count=MISSING, source=MISSING, target=MISSING):
+        self.type = type
+        self.operator = operator
+        self.condition = condition
+        self.trueBranch = trueBranch
+        self.falseBranch = falseBranch
+        self.expressions = expressions
+        self.expression = expression
+        self.count = count
+        self.source = source
+        self.target = target
+
+class TokenMapping(Record):
+    """
+    Token generated for a command or entity: the token, its category and
+    ID, and the command or entity it was generated from.
+    
+    pailang_token is a read-only alias of token, kept for compatibility
+    with callers that read it.
+    """
+    
+    __slots__ = ("token", "category", "id", "original_entity", "original_command")
+    _fields = __slots__ + ("pailang_token",)
+    
+    def __init__(self, token, category, id, original_entity=MISSING,
+                 original_command=MISSING):
+        self.token = token
+        self.category = category
+        self.id = id
+        self.original_entity = original_entity
+        self.original_command = original_command
+    
+    @property
+    def pailang_token(self):
+        """
+        str: The token (alias of token).
+        """
+        return self.token
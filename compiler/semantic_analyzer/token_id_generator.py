@@ -5,30 +5,97 @@ This module provides a robust implementation for generating and managing
 token IDs across different categories in the pAI_Lang system.
 """
 
+import atexit
 import hashlib
 import re
 import os
 import json
+from functools import lru_cache
 from pathlib import Path
-import uuid
 from pailang_tooling.utils.debug_logger import logger
 
+# Marker for keys missing from the registry or a reverse index
+_NOT_FOUND = object()
+
+# Patterns used to normalize token values
+_NON_WORD_RE = re.compile(r'[^\w\s]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Generators with registry changes not yet written to their file
+_PENDING_SAVES = set()
+
+@atexit.register
+def _flush_pending_saves():
+    """
+    Write the registries of all generators with unsaved changes.
+    """
+    for generator in list(_PENDING_SAVES):
+        generator.flush()
+
+@lru_cache(maxsize=8192)
+def _normalize_text(text):
+    """
+    Normalize a value's text for consistent token ID generation.
+    
+    The same values recur throughout a compile run, so results are cached.
+    
+    Args:
+        text (str): The text to normalize.
+        
+    Returns:
+        str: The normalized text.
+    """
+    # Convert to lowercase
+    normalized = text.lower()
+    
+    # Remove special characters
+    normalized = _NON_WORD_RE.sub('', normalized)
+    
+    # Replace whitespace with underscore
+    normalized = _WHITESPACE_RE.sub('_', normalized)
+    
+    return normalized
+
 class TokenIDGenerator:
     """
     Generates and manages consistent token IDs for pAI_Lang tokens.
     """
     
-    def __init__(self, token_registry_path=None):
+    # Fixed attribute set: no per-instance __dict__, and faster attribute
+    # access on the token generation path
+    __slots__ = (
+        "token_registry_path",
+        "compact_registry",
+        "category_prefixes",
+        "_token_registry",
+        "_category_counters",
+        "_dirty",
+        "_prefix_to_categories",
+        "_reverse_registry",
+        "_last_key",
+        "_last_token"
+    )
+    
+    def __init__(self, token_registry_path=None, compact_registry=False):
         """
         Initialize the token ID generator.
         
         Args:
             token_registry_path (str, optional): Path to token registry file.
                 If None, a default in-memory registry will be used.
+            compact_registry (bool, optional): Save the registry without
+                indentation or spacing. Defaults to False (indented JSON).
         """
         logger.debug("Initializing TokenIDGenerator")
         self.token_registry_path = token_registry_path
-        self.token_registry = self._load_token_registry()
+        self.compact_registry = compact_registry
+        
+        # Registry and counters, loaded on first use (see _ensure_loaded)
+        self._token_registry = None
+        self._category_counters = None
+        
+        # Whether the registry has changes not yet written to file
+        self._dirty = False
         
         # Define category prefixes according to the formal specification
         self.category_prefixes = {
@@ -47,13 +114,62 @@ class TokenIDGenerator:
             "security": "S"
         }
         
+        # Categories for each prefix, in definition order. A prefix may be
+        # shared ("S" is both system and security), so lookups probe each
+        # of its categories in turn; new categories should take an unused
+        # prefix to keep their tokens unambiguous
+        prefix_categories = {}
+        for category, prefix in self.category_prefixes.items():
+            prefix_categories.setdefault(prefix, []).append(category)
+        self._prefix_to_categories = {
+            prefix: tuple(categories) for prefix, categories in prefix_categories.items()
+        }
+        
+        # Per-category token ID -> value indexes, built on first lookup
+        self._reverse_registry = {}
+        
+        # Last (value, category) pair passed to generate_token_id and its
+        # token, so runs of the same token skip normalization and lookup
+        self._last_key = None
+        self._last_token = None
+        
+        logger.debug("TokenIDGenerator initialized")
+    
+    @property
+    def token_registry(self):
+        """
+        dict: Token registry by category, loaded on first access.
+        """
+        if self._token_registry is None:
+            self._ensure_loaded()
+        return self._token_registry
+    
+    @property
+    def category_counters(self):
+        """
+        dict: Next token ID counter by category, loaded on first access.
+        """
+        if self._category_counters is None:
+            self._ensure_loaded()
+        return self._category_counters
+    
+    def _ensure_loaded(self):
+        """
+        Load the token registry and its category counters.
+        
+        Loading is deferred until the registry is first used, so generators
+        that are created but never asked for a token skip reading and
+        parsing the registry file.
+        """
+        self._token_registry = self._load_token_registry()
+        
         # Initialize category counters for deterministic ID assignment
-        self.category_counters = {category: 1 for category in self.category_prefixes.keys()}
+        self._category_counters = {category: 1 for category in self.category_prefixes.keys()}
         
         # Load existing counters from registry
         self._initialize_category_counters()
         
-        logger.debug(f"TokenIDGenerator initialized with {len(self.token_registry)} registered tokens")
+        logger.debug(f"Token registry loaded with {len(self._token_registry)} registered tokens")
     
     def generate_token_id(self, value, category):
         """
@@ -66,7 +182,14 @@ class TokenIDGenerator:
         Returns:
             str: The generated token ID.
         """
-        logger.debug(f"Generating token ID for value '{value}' in category '{category}'")
+        # Log lazily: this runs for every token, usually with debug disabled
+        logger.debug("Generating token ID for value '%s' in category '%s'", value, category)
+        
+        # Same request as the previous call (only string values are
+        # remembered, since e.g. True == 1 but they normalize differently)
+        key = (value, category)
+        if key == self._last_key:
+            return self._last_token
         
         # Normalize value and category
         normalized_value = self._normalize_value(value)
@@ -76,33 +199,53 @@ class TokenIDGenerator:
         prefix = self.category_prefixes.get(normalized_category, "D")  # Default to Directive
         
         # Check if token already exists in registry
-        if normalized_category in self.token_registry and normalized_value in self.token_registry[normalized_category]:
-            token_id = self.token_registry[normalized_category][normalized_value]
-            logger.debug(f"Found existing token ID: {prefix}{token_id}")
-            return f"{prefix}{token_id}"
+        registry = self.token_registry
+        category_tokens = registry.get(normalized_category)
+        if category_tokens is not None:
+            token_id = category_tokens.get(normalized_value, _NOT_FOUND)
+            if token_id is not _NOT_FOUND:
+                logger.debug("Found existing token ID: %s%s", prefix, token_id)
+                return self._remember(key, f"{prefix}{token_id}")
         
         # Generate new token ID
         token_id = self._generate_new_token_id(normalized_value, normalized_category)
         
-        # Store in registry
-        if normalized_category not in self.token_registry:
-            self.token_registry[normalized_category] = {}
+        # Store in registry, creating the category on its first token
+        if category_tokens is None:
+            category_tokens = registry[normalized_category] = {}
         
-        self.token_registry[normalized_category][normalized_value] = token_id
+        category_tokens[normalized_value] = token_id
         
-        # Update category counter
-        if normalized_category in self.category_counters:
-            self.category_counters[normalized_category] = max(
-                self.category_counters[normalized_category],
-                int(token_id) + 1
-            )
+        # Keep the reverse index in step (the value is new to the category)
+        reverse_index = self._reverse_registry.get(normalized_category)
+        if reverse_index is not None:
+            reverse_index.setdefault(token_id, normalized_value)
         
-        # Save registry if path is provided
+        # The category counter was already advanced past the new ID by
+        # _generate_new_token_id, so it needs no update here
+        
+        # Schedule a registry save if path is provided
         if self.token_registry_path:
-            self._save_token_registry()
+            self._mark_dirty()
         
-        logger.debug(f"Generated new token ID: {prefix}{token_id}")
-        return f"{prefix}{token_id}"
+        logger.debug("Generated new token ID: %s%s", prefix, token_id)
+        return self._remember(key, f"{prefix}{token_id}")
+    
+    def _remember(self, key, token):
+        """
+        Remember the token returned for a generate_token_id request.
+        
+        Args:
+            key (tuple): The (value, category) pair as passed by the caller.
+            token (str): The token returned for it.
+            
+        Returns:
+            str: The token.
+        """
+        if type(key[0]) is str:
+            self._last_key = key
+            self._last_token = token
+        return token
     
     def get_token_id(self, value, category):
         """
@@ -139,26 +282,56 @@ class TokenIDGenerator:
         if token_id and len(token_id) > 1 and token_id[0] in self.category_prefixes.values():
             token_id = token_id[1:]
         
-        # Store in registry
-        if normalized_category not in self.token_registry:
-            self.token_registry[normalized_category] = {}
+        # Registration may change the token of the remembered request
+        self._last_key = None
+        
+        # Store in registry, creating the category on its first token
+        category_tokens = self.token_registry.get(normalized_category)
+        if category_tokens is None:
+            category_tokens = self.token_registry[normalized_category] = {}
+        
+        # Keep the reverse index in step; re-registering a value changes an
+        # existing entry, so that category's index is rebuilt on next lookup
+        reverse_index = self._reverse_registry.get(normalized_category)
+        if reverse_index is not None:
+            if normalized_value in category_tokens:
+                del self._reverse_registry[normalized_category]
+            else:
+                reverse_index.setdefault(token_id, normalized_value)
         
-        self.token_registry[normalized_category][normalized_value] = token_id
+        category_tokens[normalized_value] = token_id
         
         # Update category counter if needed
-        if normalized_category in self.category_counters and token_id.isdigit():
-            self.category_counters[normalized_category] = max(
-                self.category_counters[normalized_category],
-                int(token_id) + 1
-            )
+        counters = self.category_counters
+        if normalized_category in counters and token_id.isdigit():
+            next_id = int(token_id) + 1
+            if next_id > counters[normalized_category]:
+                counters[normalized_category] = next_id
         
-        # Save registry if path is provided
+        # Schedule a registry save if path is provided
         if self.token_registry_path:
-            self._save_token_registry()
+            self._mark_dirty()
         
         logger.debug(f"Token registered successfully")
         return True
     
+    def flush(self):
+        """
+        Write the token registry to file if it has unsaved changes.
+        
+        New and registered tokens are saved in batches rather than on every
+        change; pending changes are also written at interpreter exit.
+        
+        Returns:
+            bool: True if the registry was written, False otherwise.
+        """
+        if not self._dirty:
+            return False
+        
+        self._dirty = False
+        _PENDING_SAVES.discard(self)
+        return self._save_token_registry()
+    
     def get_value_from_token(self, token):
         """
         Get the value associated with a token ID.
@@ -179,27 +352,45 @@ class TokenIDGenerator:
         prefix = token[0]
         token_id = token[1:]
         
-        # Find category from prefix
-        category = None
-        for cat, pre in self.category_prefixes.items():
-            if pre == prefix:
-                category = cat
-                break
+        # Find candidate categories from prefix
+        categories = self._prefix_to_categories.get(prefix)
         
-        if not category:
+        if not categories:
             logger.warning(f"Unknown category prefix: {prefix}")
             return None, None
         
-        # Look up value in registry
-        if category in self.token_registry:
-            for value, tid in self.token_registry[category].items():
-                if tid == token_id:
+        # Look up value in registry, in each category sharing the prefix
+        for category in categories:
+            if category in self.token_registry:
+                value = self._get_reverse_index(category).get(token_id, _NOT_FOUND)
+                if value is not _NOT_FOUND:
                     logger.debug(f"Found value '{value}' for token '{token}'")
                     return value, category
         
         logger.warning(f"No value found for token '{token}'")
         return None, None
     
+    def _get_reverse_index(self, category):
+        """
+        Get the token ID -> value index of a category.
+        
+        The index is built from the registry on first use. When several
+        values share a token ID, the first registered value is kept.
+        
+        Args:
+            category (str): The normalized category.
+            
+        Returns:
+            dict: Mapping from token ID to value.
+        """
+        reverse_index = self._reverse_registry.get(category)
+        if reverse_index is None:
+            reverse_index = {}
+            for value, tid in self.token_registry[category].items():
+                reverse_index.setdefault(tid, value)
+            self._reverse_registry[category] = reverse_index
+        return reverse_index
+    
     def _normalize_value(self, value):
         """
         Normalize a value for consistent token ID generation.
@@ -213,16 +404,8 @@ class TokenIDGenerator:
         if not value:
             return ""
         
-        # Convert to lowercase
-        normalized = str(value).lower()
-        
-        # Remove special characters
-        normalized = re.sub(r'[^\w\s]', '', normalized)
-        
-        # Replace whitespace with underscore
-        normalized = re.sub(r'\s+', '_', normalized)
-        
-        return normalized
+        # Normalize the text form (cached, so keyed by str rather than value)
+        return _normalize_text(value if type(value) is str else str(value))
     
     def _generate_new_token_id(self, value, category):
         """
@@ -233,46 +416,53 @@ class TokenIDGenerator:
             category (str): The normalized category.
             
         Returns:
-            str: The generated token ID.
+            str: The generated token ID. The category counter is advanced
+                past it.
         """
         # Use a combination of semantic hashing and category-specific counters
         # to ensure both determinism and uniqueness
         
+        counters = self.category_counters
+        
         # Get next available ID in category
-        next_id = self.category_counters.get(category, 1)
+        next_id = counters.get(category, 1)
         
         # For deterministic generation based on value content
         if value:
             # Create a semantic hash of the value
             # Use SHA-256 for better distribution than MD5
-            hash_obj = hashlib.sha256(value.encode())
-            hash_hex = hash_obj.hexdigest()
+            digest = hashlib.sha256(value.encode()).digest()
             
-            # Use first 8 digits of hash as a seed
-            seed = int(hash_hex[:8], 16)
+            # Use the first 4 bytes (8 hex digits) of the hash as a seed
+            seed = int.from_bytes(digest[:4], "big")
             
             # Combine with category-specific counter for uniqueness
-            category_counter = self.category_counters.get(category, 1)
+            category_counter = next_id
             
             # Generate ID between 1 and 99
-            token_id = ((seed + category_counter) % 99) + 1
+            start_id = ((seed + category_counter) % 99) + 1
+            token_id = start_id
             
-            # Check for collisions
-            while category in self.token_registry and any(tid == str(token_id).zfill(2) for tid in self.token_registry[category].values()):
+            # Check for collisions against the IDs already used in the
+            # category (the keys of its reverse index)
+            used_ids = self._get_reverse_index(category) if category in self.token_registry else ()
+            while f"{token_id:02d}" in used_ids:
                 token_id = (token_id % 99) + 1
                 
-                # If we've cycled through all possible IDs, use UUID fallback
-                if token_id == ((seed + category_counter) % 99) + 1:
-                    # Generate a UUID and use last 2 digits
-                    uuid_str = str(uuid.uuid4()).replace('-', '')
-                    token_id = int(uuid_str[-2:], 16) % 99 + 1
+                # If we've cycled through all two-digit IDs, the category is
+                # full; widen to the first free ID from 100 up
+                if token_id == start_id:
+                    token_id = max(next_id, 100)
+                    while str(token_id) in used_ids:
+                        token_id += 1
+                    break
         else:
             token_id = next_id
         
         # Update category counter
-        self.category_counters[category] = max(next_id, token_id) + 1
+        counters[category] = max(next_id, token_id) + 1
         
-        # Format as 2-digit number
+        # Format as a number of at least 2 digits
         return f"{token_id:02d}"
     
     def _load_token_registry(self):
@@ -294,6 +484,14 @@ class TokenIDGenerator:
         logger.debug("Initializing empty token registry")
         return {category: {} for category in self.category_prefixes.keys()}
     
+    def _mark_dirty(self):
+        """
+        Record that the registry has changes to be written by flush().
+        """
+        if not self._dirty:
+            self._dirty = True
+            _PENDING_SAVES.add(self)
+    
     def _save_token_registry(self):
         """
         Save token registry to file.
@@ -308,9 +506,16 @@ class TokenIDGenerator:
             # Create directory if it doesn't exist
             os.makedirs(os.path.dirname(self.token_registry_path), exist_ok=True)
             
+            # Encode in one pass and write the document in a single call,
+            # rather than streaming many small chunks through json.dump
+            if self.compact_registry:
+                document = json.dumps(self.token_registry, separators=(',', ':'))
+            else:
+                document = json.dumps(self.token_registry, indent=2)
+            
             with open(self.token_registry_path, 'w') as f:
                 logger.debug(f"Saving token registry to {self.token_registry_path}")
-                json.dump(self.token_registry, f, indent=2)
+                f.write(document)
             return True
         except Exception as e:
             logger.error(f"Error saving token registry: {e}")
@@ -320,14 +525,35 @@ class TokenIDGenerator:
         """
         Initialize category counters based on existing registry entries.
         """
-        for category, tokens in self.token_registry.items():
-            if category in self.category_counters:
-                # Find the highest token ID in this category
-                max_id = 0
-                for token_id in tokens.values():
-                    if isinstance(token_id, str) and token_id.isdigit():
-                        max_id = max(max_id, int(token_id))
-                
-                # Set counter to one more than the highest ID
-                self.category_counters[category] = max_id + 1
-                logger.debug(f"Initialized counter for category '{category}' to {self.category_counters[category]}")
+        counters = self._category_counters
+        for category, tokens in self._token_registry.items():
+            if category in counters:
+                # Set counter to one more than the highest ID in this category
+                counters[category] = self._highest_token_id(tokens) + 1
+                logger.debug("Initialized counter for category '%s' to %s", category, counters[category])
+    
+    @staticmethod
+    def _highest_token_id(tokens):
+        """
+        Find the highest numeric token ID of a category.
+        
+        Categories hold many values but few distinct IDs, so each distinct
+        ID is parsed once.
+        
+        Args:
+            tokens (dict): Mapping from value to token ID.
+            
+        Returns:
+            int: The highest numeric token ID, or 0 if there is none.
+        """
+        try:
+            token_ids = set(tokens.values())
+        except TypeError:
+            # Unhashable IDs in a malformed registry; scan them all
+            token_ids = tokens.values()
+        
+        return max(
+            (int(token_id) for token_id in token_ids
+             if isinstance(token_id, str) and token_id.isdigit()),
+            default=0
+        )
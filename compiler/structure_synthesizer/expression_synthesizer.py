@@ -4,91 +4,156 @@ Expression Synthesizer module for the Structure Synthesizer component.
 This module provides functionality for synthesizing pAI_Lang strings from expression trees.
 """
 
+from types import MappingProxyType
+
+# Memo marker for nodes whose children are still being synthesized
+_IN_PROGRESS = object()
+
 class ExpressionSynthesizer:
     """
     Synthesizes pAI_Lang strings from expression trees.
     """
     
+    # Operator precedence (higher number = higher precedence)
+    _OPERATOR_PRECEDENCE = MappingProxyType({
+        "?:": 1,  # Conditional (lowest precedence)
+        ">": 2,   # Sequence
+        "&": 3,   # Parallel
+        "!": 4,   # Context activation
+        "**": 5,  # Repetition
+        "|": 6    # Piping (highest precedence)
+    })
+    
+    # Operators whose subexpressions need brackets as operands of each
+    # parent operator; left and right operands currently share the rules
+    _BRACKETED_OPERANDS = MappingProxyType({
+        ">": frozenset({"?:"}),
+        "&": frozenset({"?:", ">"}),
+        "!": frozenset({"?:", ">", "&"}),
+        "**": frozenset({"?:", ">", "&", "!"}),
+        "|": frozenset({"?:", ">", "&", "!", "**"})
+    })
+    
+    # Bracketing requirements by operand position
+    _REQUIRES_BRACKETS = MappingProxyType({
+        # When operator is used as left operand of parent operator
+        "left": _BRACKETED_OPERANDS,
+        # When operator is used as right operand of parent operator
+        "right": _BRACKETED_OPERANDS
+    })
+    
     def __init__(self):
         """
         Initialize the expression synthesizer.
         
-        Sets up the operator precedence rules and bracketing requirements
-        for different expression types in pAI_Lang.
+        The operator precedence rules and bracketing requirements for
+        different expression types in pAI_Lang are shared class-level
+        constants; the instance only exposes them.
         """
-        # Define operator precedence (higher number = higher precedence)
-        self.operator_precedence = {
-            "?:": 1,  # Conditional (lowest precedence)
-            ">": 2,   # Sequence
-            "&": 3,   # Parallel
-            "!": 4,   # Context activation
-            "**": 5,  # Repetition
-            "|": 6    # Piping (highest precedence)
-        }
-        
-        # Define which operators require brackets in different contexts
-        self.requires_brackets = {
-            # When operator is used as left operand of parent operator
-            "left": {
-                ">": {"?:"},
-                "&": {"?:", ">"},
-                "!": {"?:", ">", "&"},
-                "**": {"?:", ">", "&", "!"},
-                "|": {"?:", ">", "&", "!", "**"}
-            },
-            # When operator is used as right operand of parent operator
-            "right": {
-                ">": {"?:"},
-                "&": {"?:", ">"},
-                "!": {"?:", ">", "&"},
-                "**": {"?:", ">", "&", "!"},
-                "|": {"?:", ">", "&", "!", "**"}
-            }
-        }
+        self.operator_precedence = self._OPERATOR_PRECEDENCE
+        self.requires_brackets = self._REQUIRES_BRACKETS
     
     def synthesize_from_tree(self, tree):
         """
         Synthesize pAI_Lang string from expression tree.
         
+        The tree is walked in post-order with an explicit stack, so deep
+        trees do not hit the recursion limit. A subtree that appears in
+        several positions of the tree is synthesized once; later
+        occurrences reuse its string.
+        
         Args:
             tree (dict): Expression tree.
             
         Returns:
             str: Synthesized pAI_Lang string.
+            
+        Raises:
+            ValueError: If the tree contains a cycle.
         """
-        if tree is None:
-            return ""
+        # Strings of the nodes synthesized so far, by node id
+        memo = {}
         
-        tree_type = tree.get("type")
+        # Strings of synthesized child nodes, in order
+        results = []
+        append = results.append
         
-        if tree_type == "token":
-            return tree.get("value", "")
+        # Entries are (node, type): type is None until the node's children
+        # have been pushed, after which the node is revisited to combine them
+        stack = [(tree, None)]
+        pop = stack.pop
+        push = stack.append
         
-        elif tree_type == "sequence":
-            left = self.synthesize_from_tree(tree.get("left"))
-            right = self.synthesize_from_tree(tree.get("right"))
-            return f"{left}{tree.get('operator', '>')}{right}"
-        
-        elif tree_type == "parallel":
-            left = self.synthesize_from_tree(tree.get("left"))
-            right = self.synthesize_from_tree(tree.get("right"))
-            return f"{left}{tree.get('operator', '&')}{right}"
-        
-        elif tree_type == "conditional":
-            condition = self.synthesize_from_tree(tree.get("condition"))
-            true_branch = self.synthesize_from_tree(tree.get("true_branch"))
+        while stack:
+            node, tree_type = pop()
+            
+            if tree_type is None:
+                if node is None:
+                    append("")
+                    continue
+                
+                key = id(node)
+                result = memo.get(key)
+                if result is not None:
+                    if result is _IN_PROGRESS:
+                        raise ValueError("Expression tree contains a cycle")
+                    append(result)
+                    continue
+                
+                tree_type = node.get("type")
+                
+                # Push the node for revisiting, then its children with the
+                # first child on top of the stack
+                if tree_type == "sequence" or tree_type == "parallel":
+                    push((node, tree_type))
+                    push((node.get("right"), None))
+                    push((node.get("left"), None))
+                
+                elif tree_type == "conditional":
+                    push((node, tree_type))
+                    
+                    # Check if false branch exists
+                    if "false_branch" in node:
+                        push((node.get("false_branch"), None))
+                    push((node.get("true_branch"), None))
+                    push((node.get("condition"), None))
+                
+                elif tree_type == "repetition":
+                    push((node, tree_type))
+                    push((node.get("expression"), None))
+                
+                else:
+                    # Token or unknown node type
+                    result = node.get("value", "") if tree_type == "token" else ""
+                    memo[key] = result
+                    append(result)
+                    continue
+                
+                memo[key] = _IN_PROGRESS
+                continue
+            
+            # Combine the child strings of a revisited node
+            if tree_type == "sequence" or tree_type == "parallel":
+                right = results.pop()
+                left = results.pop()
+                default_operator = ">" if tree_type == "sequence" else "&"
+                result = f"{left}{node.get('operator', default_operator)}{right}"
+            
+            elif tree_type == "conditional":
+                if "false_branch" in node:
+                    false_branch = results.pop()
+                    true_branch = results.pop()
+                    result = f"{results.pop()}?{true_branch}:{false_branch}"
+                else:
+                    true_branch = results.pop()
+                    result = f"{results.pop()}?{true_branch}"
             
-            # Check if false branch exists
-            if "false_branch" in tree:
-                false_branch = self.synthesize_from_tree(tree.get("false_branch"))
-                return f"{condition}?{true_branch}:{false_branch}"
             else:
-                return f"{condition}?{true_branch}"
-        
-        elif tree_type == "repetition":
-            count = tree.get("count", 1)
-            expression = self.synthesize_from_tree(tree.get("expression"))
-            return f"**{count}{expression}"
+                # Repetition
+                count = node.get("count", 1)
+                result = f"**{count}{results.pop()}"
+            
+            memo[id(node)] = result
+            append(result)
         
-        # Unknown node type
-        return ""
+        return results[0]
@@ -22,6 +22,14 @@ class TreeBuilder(NodeOperations, TreeManipulation, UtilityFunctions):
             operator_precedence (dict): Operator precedence map.
         """
         self.operator_precedence = operator_precedence
+        
+        # Tree update methods by relationship type
+        self._relationship_handlers = {
+            "sequence": self._add_sequence_to_tree,
+            "parallel": self._add_parallel_to_tree,
+            "conditional": self._add_conditional_to_tree,
+            "repetition": self._add_repetition_to_tree
+        }
     
     def build_expression_tree(self, relationships):
         """
@@ -44,16 +52,10 @@ class TreeBuilder(NodeOperations, TreeManipulation, UtilityFunctions):
         tree = None
         
         # Process each relationship
+        handlers = self._relationship_handlers
         for relationship in sorted_relationships:
-            rel_type = relationship.get("type")
-            
-            if rel_type == "sequence":
-                tree = self._add_sequence_to_tree(relationship, tree)
-            elif rel_type == "parallel":
-                tree = self._add_parallel_to_tree(relationship, tree)
-            elif rel_type == "conditional":
-                tree = self._add_conditional_to_tree(relationship, tree)
-            elif rel_type == "repetition":
-                tree = self._add_repetition_to_tree(relationship, tree)
+            handler = handlers.get(relationship.get("type"))
+            if handler:
+                tree = handler(relationship, tree)
         
         return tree
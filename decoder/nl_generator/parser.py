@@ -171,30 +171,27 @@ class CLParser:
         
         # Split by commas, but respect nested structures
         param_parts = []
-        current_part = ""
+        start = 0
         bracket_depth = 0
         
-        for char in params_str:
+        for i, char in enumerate(params_str):
             if char == '[':
                 bracket_depth += 1
-                current_part += char
             elif char == ']':
                 bracket_depth -= 1
-                current_part += char
             elif char == ',' and bracket_depth == 0:
-                param_parts.append(current_part.strip())
-                current_part = ""
-            else:
-                current_part += char
+                param_parts.append(params_str[start:i].strip())
+                start = i + 1
         
         # Add the last part if not empty
-        if current_part.strip():
-            param_parts.append(current_part.strip())
+        last_part = params_str[start:].strip()
+        if last_part:
+            param_parts.append(last_part)
         
         # Process each parameter part
         for part in param_parts:
-            if '=' in part:
-                key, value = part.split('=', 1)
+            key, sep, value = part.partition('=')
+            if sep:
                 params[key.strip()] = value.strip()
             else:
                 # For parameters without explicit key
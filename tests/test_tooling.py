@@ -13,12 +13,16 @@ import time
 import sys
 import re
 import json
+import shutil
+import tempfile
 from pathlib import Path
+from unittest import mock
 
 # Add parent directory to path to allow importing pailang_tooling
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from pailang_tooling.compiler.parser import Parser
+from pailang_tooling.compiler.parser import nl_parser as nl_parser_module
 from pailang_tooling.compiler.semantic_analyzer import SemanticAnalyzer
 from pailang_tooling.compiler.structure_synthesizer import StructureSynthesizer
 from pailang_tooling.compiler.compiler import Compiler
@@ -29,6 +33,7 @@ from pailang_tooling.decoder.expansion_engine import ExpansionEngine
 from pailang_tooling.decoder.nl_generator import NLGenerator
 from pailang_tooling.transformer.transformer import MatricesTransformer
 from pailang_tooling.transformer.matrix_loader import MatrixLoader
+from pailang_tooling.compiler.semantic_analyzer import token_id_generator as token_id_generator_module
 from pailang_tooling.compiler.semantic_analyzer.token_id_generator import TokenIDGenerator
 from pailang_tooling.api import PAILangTooling as PAILangAPI
 from pailang_tooling.utils.debug_logger import logger
@@ -247,6 +252,151 @@ class TestParser(unittest.TestCase):
         result = self.parser.parse_cl("INVALID COMMAND")
         self.assertIsNotNone(result)
         self.assertIn("error", str(result).lower())
+    
+    def test_cl_parser_hierarchy_nesting(self):
+        """Test that indented commands are nested under their parent."""
+        result = self.parser.cl_parser.parse_cl(CL_SAMPLES["complex"])
+        hierarchy = result["hierarchy"]
+        self.assertEqual([node["name"] for node in hierarchy],
+                         ["ACTIVATE_CONTEXT", "CONDITIONAL", "ELSE", "END_CONDITIONAL"])
+        parallel = hierarchy[1]["children"][0]
+        self.assertEqual(parallel["name"], "PARALLEL")
+        self.assertEqual(parallel["indentation"], 4)
+        self.assertEqual([child["parameters"]["TASK"] for child in parallel["children"]],
+                         ["process_payment", "update_account"])
+        # Hierarchy nodes are the command dicts themselves
+        self.assertIs(result["commands"][2], parallel)
+    
+    def test_cl_parser_parameters(self):
+        """Test splitting of CL parameter lists."""
+        cl_parser = self.parser.cl_parser
+        self.assertEqual(cl_parser._parse_parameters("TASK=a, X=[a,b], FLAG"),
+                         {"TASK": "a", "X": "[a,b]", "FLAG": True})
+        self.assertEqual(cl_parser._parse_parameters("a = 1 , b=2=3"), {"a": "1", "b": "2=3"})
+        
+        # Empty parts are kept as "" keys, except a trailing one
+        self.assertEqual(cl_parser._parse_parameters("a,,b,"), {"a": True, "": True, "b": True})
+        self.assertEqual(cl_parser._parse_parameters(","), {"": True})
+    
+    def test_cl_parser_known_commands(self):
+        """Test recognition of the known command types."""
+        cl_parser = self.parser.cl_parser
+        for command_name in cl_parser.command_types:
+            self.assertTrue(cl_parser.is_known_command(command_name), command_name)
+        for command_name in ("END_PARALLEL", "EXECUTE-TASK", "execute", ""):
+            self.assertFalse(cl_parser.is_known_command(command_name), command_name)
+    
+    def test_cl_parser_command_names(self):
+        """Test that command names are read whole."""
+        result = self.parser.cl_parser.parse_cl(">>> EXECUTE_TASK2 [TASK=retrieve_customer_data]\n>>> STEP_2")
+        self.assertEqual([command["name"] for command in result["commands"]], ["EXECUTE_TASK2", "STEP_2"])
+        self.assertEqual(result["commands"][0]["parameters"], {"TASK": "retrieve_customer_data"})
+        
+        # Other names are kept whole and reported
+        with mock.patch.object(logger, "warning") as warning:
+            result = self.parser.cl_parser.parse_cl(">>> A1b\n>>> EXECUTE-TASK [TASK=x]\n>>> execute [TASK=y]")
+        self.assertEqual([command["name"] for command in result["commands"]], ["A1b", "EXECUTE-TASK", "execute"])
+        self.assertEqual(result["commands"][2]["parameters"], {"TASK": "y"})
+        self.assertEqual(warning.call_count, 3)
+        self.assertIn(">>> EXECUTE-TASK [TASK=x]", warning.call_args_list[1][0][0])
+    
+    def _pattern_example(self, regex):
+        """Build a text matched by an NL pattern."""
+        example = regex.pattern
+        # Drop optional groups, then keep the first alternative of the others
+        example = re.sub(r"\(\?:[^()]*\([^()]*\)\)\?", "", example)
+        example = re.sub(r"\((?:\?:)?([^()|]*)(?:\|[^()]*)?\)", r"(\1)", example)
+        for group, text in (("(\\w+)", "alpha"), ("(.+?)", "beta gamma"), ("(.+)", "delta"), ("(\\d+)", "3")):
+            example = example.replace(group, text)
+        example = re.sub(r"\(([^()]*)\)", r"\1", example).replace("\\.", ".").replace("$", "")
+        self.assertIsNotNone(regex.search(example), f"no example for pattern {regex.pattern!r}")
+        return example
+    
+    def test_nl_parser_prefilter_keeps_matches(self):
+        """Test that the trigger prefilter never skips a pattern that matches."""
+        nl_parser = self.parser.nl_parser
+        regexes = [
+            regex
+            for patterns in (nl_parser.intent_patterns, nl_parser.entity_patterns)
+            for pattern_list in patterns.values()
+            for _, regex in pattern_list
+        ]
+        regexes += [
+            regex
+            for patterns in (nl_parser_module._SEQUENCE_PATTERNS, nl_parser_module._PARALLEL_PATTERNS,
+                             nl_parser_module._CONDITIONAL_PATTERNS, nl_parser_module._REPETITION_PATTERNS)
+            for regex, _ in patterns
+        ]
+        
+        texts = list(NL_SAMPLES.values())
+        for regex in regexes:
+            example = self._pattern_example(regex)
+            texts += [example, f"Please {example} now.", example.upper()]
+        
+        # Passing every category as a candidate disables the prefilter
+        all_categories = nl_parser.prefilter[1]
+        for nl_text in texts:
+            intents = nl_parser._recognize_intents(nl_text)
+            self.assertEqual(intents, nl_parser._recognize_intents(nl_text, all_categories), nl_text)
+            
+            entities = nl_parser._extract_entities(nl_text, intents)
+            self.assertEqual(entities, nl_parser._extract_entities(nl_text, intents, all_categories), nl_text)
+            
+            relationships = nl_parser._extract_relationships(nl_text, entities)
+            self.assertEqual(relationships, nl_parser._extract_relationships(nl_text, entities, all_categories), nl_text)
+    
+    def test_parser_records_are_mappings(self):
+        """Test that parser records read like the dicts they replace."""
+        command = self.parser.cl_parser.parse_cl(">>> EXECUTE_TASK [TASK=retrieve_customer_data]")["commands"][0]
+        command_dict = command.to_dict()
+        self.assertEqual(len(command), len(command_dict))
+        self.assertEqual(list(command.keys()), list(command_dict))
+        self.assertEqual(list(command.values()), list(command_dict.values()))
+        self.assertEqual(dict(command), command_dict)
+        self.assertEqual(json.loads(json.dumps(command.to_dict())), command_dict)
+        
+        # Unset optional fields are left out, like missing dict keys
+        intent = nl_parser_module.Intent("query_execution", r"query (\w+)", "query orders")
+        self.assertNotIn("groups", intent)
+        self.assertEqual(len(intent), 3)
+        self.assertEqual(dict(intent), {"category": "query_execution", "pattern": r"query (\w+)", "match": "query orders"})
+        
+        # Copies are equal but independent
+        copy = command.copy()
+        self.assertEqual(copy, command)
+        self.assertIsNot(copy, command)
+        copy["name"] = "OTHER"
+        self.assertEqual(command["name"], "EXECUTE_TASK")
+    
+    def test_nl_parser_cache_returns_copies(self):
+        """Test that changing a parse result does not change later parses."""
+        nl_text = "Initialize processing system then execute retrieve task if valid then run report task"
+        result = self.parser.nl_parser.parse_nl(nl_text)
+        expected = nl_parser_module.NLParser().parse_nl(nl_text)
+        self.assertTrue(result["intents"])
+        self.assertTrue(result["relationships"])
+        
+        result["intents"].clear()
+        result["relationships"][0]["type"] = "changed"
+        for entity_list in result["entities"].values():
+            entity_list.clear()
+        
+        self.assertEqual(Parser().nl_parser.parse_nl(nl_text), expected)
+    
+    def test_nl_parser_parse_many(self):
+        """Test that batch parsing keeps input order and reuses the cache."""
+        nl_parser = nl_parser_module.NLParser()
+        texts = [NL_SAMPLES["basic"], NL_SAMPLES["sequence"], NL_SAMPLES["basic"], NL_SAMPLES["conditional"]]
+        
+        with mock.patch.object(nl_parser, "_recognize_intents", wraps=nl_parser._recognize_intents) as recognize:
+            results = nl_parser.parse_many(texts)
+        
+        self.assertEqual([result["original_text"] for result in results], texts)
+        self.assertEqual(results, [nl_parser_module.NLParser().parse_nl(nl_text) for nl_text in texts])
+        
+        # The repeated input is parsed once and served from the cache
+        self.assertEqual(recognize.call_count, 3)
+        self.assertIsNot(results[0], results[2])
 
 # Unit Tests for Semantic Analyzer Component
 class TestSemanticAnalyzer(unittest.TestCase):
@@ -294,6 +444,24 @@ class TestSemanticAnalyzer(unittest.TestCase):
         # Verify no collisions
         self.assertEqual(len(ids), 10)
     
+    def test_token_id_generation_beyond_two_digits(self):
+        """Test that a category keeps issuing unique IDs after all 99 two-digit IDs are used."""
+        token_id_generator = TokenIDGenerator()
+        ids = {token_id_generator.generate_token_id(f"concept_{i}", "Task") for i in range(150)}
+        
+        # Verify no collisions, and that the extra IDs are wider
+        self.assertEqual(len(ids), 150)
+        self.assertTrue(any(len(token_id) > 3 for token_id in ids))
+    
+    def test_security_token_lookup(self):
+        """Test looking up tokens of the security category, which shares the S prefix with system."""
+        token_id_generator = TokenIDGenerator()
+        token_id_generator.register_token("initialize_system", "System", "S41")
+        token_id_generator.register_token("access_control", "Security", "S42")
+        
+        self.assertEqual(token_id_generator.get_value_from_token("S42"), ("access_control", "security"))
+        self.assertEqual(token_id_generator.get_value_from_token("S41"), ("initialize_system", "system"))
+    
     def test_analyzer_context_handling(self):
         """Test semantic analyzer context handling."""
         parsed = self.parser.parse_nl(NL_SAMPLES["context"])
@@ -322,6 +490,108 @@ class TestSemanticAnalyzer(unittest.TestCase):
         self.assertIsNotNone(result)
         self.assertIn("parallel", str(result).lower())
 
+# Unit Tests for Token Registry Persistence
+class TestTokenRegistry(unittest.TestCase):
+    """Test cases for loading and saving the token registry."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.registry_path = os.path.join(self.temp_dir, "data", "token_registry.json")
+    
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir)
+    
+    def _read_registry(self):
+        """Read the saved token registry."""
+        with open(self.registry_path, "r") as f:
+            return json.load(f)
+    
+    def test_generator_without_registry_file(self):
+        """Test that a generator works before its registry file exists."""
+        token_id_generator = TokenIDGenerator(self.registry_path)
+        self.assertFalse(os.path.exists(self.registry_path))
+        
+        token_id = token_id_generator.generate_token_id("initialize_system", "System")
+        self.assertTrue(token_id.startswith("S"))
+        self.assertEqual(token_id_generator.get_value_from_token(token_id), ("initialize_system", "system"))
+        
+        # New tokens are only written on flush
+        self.assertFalse(os.path.exists(self.registry_path))
+        self.assertTrue(token_id_generator.flush())
+        self.assertEqual(self._read_registry()["system"], {"initialize_system": token_id[1:]})
+    
+    def test_flush_writes_registry_once(self):
+        """Test that registered tokens are written once, by flush."""
+        token_id_generator = TokenIDGenerator(self.registry_path)
+        with mock.patch.object(TokenIDGenerator, "_save_token_registry", autospec=True,
+                               side_effect=TokenIDGenerator._save_token_registry) as save:
+            token_id_generator.register_token("retrieve_customer_data", "Task", "T12")
+            token_id_generator.register_token("generate_report", "Task", "T13")
+            self.assertEqual(save.call_count, 0)
+            
+            self.assertTrue(token_id_generator.flush())
+            self.assertFalse(token_id_generator.flush())
+            self.assertEqual(save.call_count, 1)
+        
+        self.assertEqual(self._read_registry()["task"], {"retrieve_customer_data": "12", "generate_report": "13"})
+    
+    def test_pending_changes_written_at_exit(self):
+        """Test that unsaved changes are written by the exit hook."""
+        token_id_generator = TokenIDGenerator(self.registry_path)
+        token_id_generator.register_token("generate_report", "Task", "T13")
+        
+        token_id_generator_module._flush_pending_saves()
+        self.assertEqual(self._read_registry()["task"], {"generate_report": "13"})
+        self.assertFalse(token_id_generator.flush())
+    
+    def test_clean_generator_does_not_write(self):
+        """Test that a generator without changes never writes its registry."""
+        os.makedirs(os.path.dirname(self.registry_path))
+        with open(self.registry_path, "w") as f:
+            json.dump({"task": {"generate_report": "13"}}, f)
+        
+        token_id_generator = TokenIDGenerator(self.registry_path)
+        with mock.patch.object(TokenIDGenerator, "_save_token_registry", autospec=True) as save:
+            self.assertEqual(token_id_generator.generate_token_id("generate_report", "Task"), "T13")
+            self.assertEqual(token_id_generator.get_value_from_token("T13"), ("generate_report", "task"))
+            self.assertFalse(token_id_generator.flush())
+            token_id_generator_module._flush_pending_saves()
+            self.assertEqual(save.call_count, 0)
+    
+    def test_compact_registry(self):
+        """Test that the registry is saved compact or indented and loads back."""
+        for compact_registry in (True, False):
+            token_id_generator = TokenIDGenerator(self.registry_path, compact_registry=compact_registry)
+            token_id_generator.register_token("generate_report", "Task", "T13")
+            token_id_generator.register_token("initialize_system", "System", "S2")
+            self.assertTrue(token_id_generator.flush())
+            
+            with open(self.registry_path, "r") as f:
+                document = f.read()
+            registry = json.loads(document)
+            if compact_registry:
+                self.assertEqual(document, json.dumps(registry, separators=(",", ":")))
+            else:
+                self.assertEqual(document, json.dumps(registry, indent=2))
+            
+            # A new generator reads the saved tokens back
+            loaded = TokenIDGenerator(self.registry_path)
+            self.assertEqual(loaded.get_value_from_token("T13"), ("generate_report", "task"))
+            self.assertEqual(loaded.get_value_from_token("S2"), ("initialize_system", "system"))
+            self.assertEqual(loaded.generate_token_id("generate_report", "Task"), "T13")
+            os.remove(self.registry_path)
+    
+    def test_transformer_get_token_id_saves_registry(self):
+        """Test that a token created through the transformer is saved at once."""
+        matrices = {matrix_type: {} for matrix_type in ("nl_to_cl", "cl_to_pailang", "pailang_to_cl", "cl_to_nl")}
+        transformer = MatricesTransformer(matrix_data=matrices, token_registry_path=self.registry_path)
+        
+        token_id = transformer.get_token_id("generate_report", "Task")
+        self.assertEqual(self._read_registry()["task"], {"generate_report": token_id[1:]})
+        self.assertFalse(transformer.token_id_generator.flush())
+
 # Unit Tests for Structure Synthesizer Component
 class TestStructureSynthesizer(unittest.TestCase):
     """Test cases for the Structure Synthesizer component."""
@@ -523,6 +793,27 @@ class TestCompiler(unittest.TestCase):
         result = self.compiler.compile_cl("INVALID COMMAND")
         self.assertIsNotNone(result)
         self.assertIn("error", str(result).lower())
+    
+    def test_register_token_clears_cache(self):
+        """Test that registering a token discards cached compilations."""
+        self.compiler.compile(CL_SAMPLES["basic"], "CL")
+        self.assertIn(("CL", CL_SAMPLES["basic"]), self.compiler.cache)
+        
+        self.compiler.register_token("processing", "System", "S07")
+        self.assertEqual(self.compiler.cache, {})
+    
+    def test_cache_eviction(self):
+        """Test that the compilation cache drops its oldest entries when full."""
+        self.compiler.max_cache_size = 3
+        inputs = [f">>> EXECUTE_TASK [TASK=task_{i}]" for i in range(5)]
+        for cl_text in inputs:
+            self.compiler.compile(cl_text, "CL")
+        
+        self.assertEqual(list(self.compiler.cache), [("CL", cl_text) for cl_text in inputs[2:]])
+        
+        # A cached input is served without adding an entry
+        self.compiler.compile(inputs[-1], "CL")
+        self.assertEqual(len(self.compiler.cache), 3)
 
 # Unit Tests for PAI_Lang Parser Component
 class TestPAILangParser(unittest.TestCase):
@@ -1232,6 +1523,47 @@ class TestPAILangAPI(unittest.TestCase):
         self.assertIsNotNone(result)
         self.assertIn("error", str(result).lower())
 
+# Integration Tests for File Processing
+class TestProcessFile(unittest.TestCase):
+    """Test cases for processing files through the API."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.api = PAILangAPI(token_registry_path=os.path.join(self.temp_dir, "token_registry.json"))
+    
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_process_file_cl_matches_compile(self):
+        """Test that a multi-block CL file compiles the same as its whole text."""
+        cl_text = "\n\n".join([CL_SAMPLES["context"], CL_SAMPLES["sequence"], CL_SAMPLES["conditional"]]) + "\n"
+        input_file = os.path.join(self.temp_dir, "input.cl")
+        output_file = os.path.join(self.temp_dir, "output.pai")
+        with open(input_file, "w") as f:
+            f.write(cl_text)
+        
+        self.assertTrue(self.api.process_file(input_file, output_file, input_type="CL"))
+        with open(output_file, "r") as f:
+            output_text = f.read()
+        
+        self.api.clear_cache()
+        self.assertEqual(output_text, self.api.compile(cl_text, "CL"))
+    
+    def test_clear_cache_clears_transformer(self):
+        """Test that clearing the API cache empties the transformer caches."""
+        transformer = self.api.transformer
+        transformer.cache["cl_to_nl"]["input"] = "output"
+        
+        self.api.clear_cache()
+        self.assertEqual(transformer.cache, {
+            "nl_to_cl": {},
+            "cl_to_pailang": {},
+            "pailang_to_cl": {},
+            "cl_to_nl": {}
+        })
+
 # Performance Tests
 class TestPerformance(unittest.TestCase):
     """Performance tests for the pAI_Lang tooling system."""
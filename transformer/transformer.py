@@ -109,6 +109,9 @@ class MatricesTransformer:
         # Use specialized transformer
         pailang_output = self.cl_pailang_transformer.transform(cl_input)
         
+        # Save the tokens this transformation added, once
+        self.token_id_generator.flush()
+        
         # Cache the result
         self.cache["cl_to_pailang"][cl_input] = pailang_output
         
@@ -254,6 +257,13 @@ class MatricesTransformer:
         # Save updated matrix
         return self.matrix_loader.save_matrix(matrix_type, self.matrices[matrix_type])
     
+    def clear_cache(self):
+        """
+        Clear the cache of transformation results for every matrix type.
+        """
+        for matrix_type in self.cache:
+            self.cache[matrix_type] = {}
+    
     def get_token_id(self, value, category):
         """
         Get a token ID for a value in a specific category.
@@ -265,7 +275,9 @@ class MatricesTransformer:
         Returns:
             str: The token ID.
         """
-        return self.token_id_generator.get_token_id(value, category)
+        token = self.token_id_generator.get_token_id(value, category)
+        self.token_id_generator.flush()
+        return token
     
     def get_value_from_token(self, token):
         """
@@ -130,7 +130,8 @@ class CLToPAILangTransformer(BaseTransformer):
             subcommands = []
             lines = cl_input.split('\n')
             for i, line in enumerate(lines):
-                if i > 0 and line.strip().startswith('>>>') and line.startswith('    '):
+                # Cheap indentation check first; only indented lines are stripped
+                if i > 0 and line.startswith('    ') and line.lstrip().startswith('>>>'):
                     subcommands.append(line.strip())
             
             result = {